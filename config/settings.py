@@ -4,13 +4,19 @@ from pathlib import Path
 
 BASE_DIR = Path(__file__).resolve().parent.parent
 env = environ.Env()
-environ.Env.read_env(os.path.join(BASE_DIR, ".env"))
+# in production the orchestrator supplies env vars, so only parse .env if present
+ENV_FILE = BASE_DIR / ".env"
+if ENV_FILE.exists():
+    environ.Env.read_env(str(ENV_FILE))
 
 ROOT_URLCONF = "config.urls"
 WSGI_APPLICATION = "config.wsgi.application"
 
 SECRET_KEY = env("SECRET_KEY")
 DEBUG = env.bool("DJANGO_DEBUG", default=True)
+
+# Map widgets in the admin for geometry fields (see core/admin.py)
+ENABLE_GIS_ADMIN = env.bool("ENABLE_GIS_ADMIN", default=True)
 ALLOWED_HOSTS = ["*"]
 
 INSTALLED_APPS = [
@@ -28,6 +34,7 @@ INSTALLED_APPS = [
 
 MIDDLEWARE = [
     "django.middleware.security.SecurityMiddleware",
+    "core.middleware.ClientIpMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
     "django.middleware.csrf.CsrfViewMiddleware",
@@ -37,6 +44,12 @@ MIDDLEWARE = [
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
 ]
 
+AUTHENTICATION_BACKENDS = [
+    "core.backends.ProfileModelBackend",
+    # still listed so sessions created before the switch stay logged in
+    "django.contrib.auth.backends.ModelBackend",
+]
+
 TEMPLATES = [
     {
         "BACKEND": "django.template.backends.django.DjangoTemplates",
@@ -61,6 +74,10 @@ DATABASES = {
         "PASSWORD": env("DB_PASS"),
         "HOST": env("DB_HOST"),
         "PORT": env("DB_PORT"),
+        # keep connections (and the per-connection plan/catalog caches Postgres
+        # builds up) across requests instead of reconnecting on every request
+        "CONN_MAX_AGE": env.int("DB_CONN_MAX_AGE", default=60),
+        "CONN_HEALTH_CHECKS": True,
     }
 }
 
@@ -77,6 +94,11 @@ CACHES = {
 }
 
 DATA_UPLOAD_MAX_MEMORY_SIZE = 10 * 1024 * 1024  # 10 MB - we might need to make this larger after testing 
+# same as Django's defaults, but the file is hashed as it streams in (see core/upload_handlers.py)
+FILE_UPLOAD_HANDLERS = [
+    "core.upload_handlers.Sha256MemoryFileUploadHandler",
+    "core.upload_handlers.Sha256TemporaryFileUploadHandler",
+]
 LOGIN_URL = "/auth/login/"
 LOGIN_REDIRECT_URL = "/"
 LOGOUT_REDIRECT_URL = "/auth/login/"
@@ -97,7 +119,7 @@ USE_L10N = True
 # MinIO storage configuration (Django 5.x STORAGES format)
 STORAGES = {
     "default": {
-        "BACKEND": "storages.backends.s3boto3.S3Boto3Storage",
+        "BACKEND": "core.storage.MinioStorage",
         "OPTIONS": {
             "access_key": env("MINIO_ROOT_USER"),
             "secret_key": env("MINIO_ROOT_PASSWORD"),
@@ -108,9 +130,24 @@ STORAGES = {
             "use_ssl": env.bool("MINIO_USE_SSL", default=False),
             "file_overwrite": False,
             "default_acl": None,
+            # plain dicts so loading settings doesn't import boto3; MinioStorage
+            # builds the botocore Config / TransferConfig from them
+            # bigger connection pool + path-style addressing for MinIO on the LAN
+            "client_config": {"max_pool_connections": 64, "s3": {"addressing_style": "path"}},
+            # 16MB multipart parts uploaded concurrently instead of one single-stream PUT
+            "transfer_config": {
+                "multipart_threshold": 16 * 1024 * 1024,
+                "multipart_chunksize": 16 * 1024 * 1024,
+                "max_concurrency": 10,
+                "use_threads": True,
+            },
         },
     },
     "staticfiles": {
         "BACKEND": "django.contrib.staticfiles.storage.StaticFilesStorage",
     },
 }
+
+# Browser-facing MinIO endpoint used to sign direct-upload URLs; the signature
+# covers the host, so it has to be the address the browser actually PUTs to
+MINIO_PRESIGN_ENDPOINT_URL = f"http://{env('MINIO_EXTERNAL_ENDPOINT', default='localhost:9000')}"
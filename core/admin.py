@@ -1,6 +1,13 @@
 # core/admin.py
+from django.conf import settings
 from django.contrib import admin as djadmin
-from django.contrib.gis.admin import GISModelAdmin
+
+# the map widget admin pulls in the GIS admin/forms stack; processes that never
+# serve the admin (workers, one-off commands) can opt out with ENABLE_GIS_ADMIN=0
+if settings.ENABLE_GIS_ADMIN:
+    from django.contrib.gis.admin import GISModelAdmin
+else:
+    GISModelAdmin = djadmin.ModelAdmin
 
 from .models import (
     Process, Document, Organisation, Prospect, Tenement, Drillhole,
@@ -18,12 +25,14 @@ class OrganisationAdmin(djadmin.ModelAdmin):
 @djadmin.register(Process)
 class ProcessAdmin(GISModelAdmin):
     list_display = ("name", "mode", "commodity", "organisation")
+    list_select_related = ("organisation",)
     list_filter = ("mode", "organisation")
     search_fields = ("name", "commodity")
 
 @djadmin.register(Document)
 class DocumentAdmin(djadmin.ModelAdmin):
     list_display = ("title", "timestamp", "doc_type", "confidentiality", "process", "created_by")
+    list_select_related = ("process", "created_by")
     list_filter = ("doc_type", "confidentiality", "organisation")
     search_fields = ("title", "checksum_sha256")
     readonly_fields = ("checksum_sha256", "created_at", "updated_at")
@@ -31,6 +40,7 @@ class DocumentAdmin(djadmin.ModelAdmin):
 @djadmin.register(Prospect)
 class ProspectAdmin(GISModelAdmin):
     list_display = ("name", "organisation", "process", "created_at")
+    list_select_related = ("organisation", "process")
     list_filter = ("organisation",)
     search_fields = ("name", "hypothesis", "objective")
     readonly_fields = ("created_at", "updated_at")
@@ -53,12 +63,14 @@ class ProspectAdmin(GISModelAdmin):
 @djadmin.register(Tenement)
 class TenementAdmin(GISModelAdmin):  
     list_display = ("name", "organisation", "process", "created_at")
+    list_select_related = ("organisation", "process")
     list_filter = ("organisation",)
     search_fields = ("name",)
 
 @djadmin.register(Drillhole)
 class DrillholeAdmin(GISModelAdmin):  
     list_display = ("name", "organisation", "process", "depth", "created_at")
+    list_select_related = ("organisation", "process")
     list_filter = ("organisation",)
     search_fields = ("name",)
 
@@ -67,6 +79,7 @@ class DrillholeAdmin(GISModelAdmin):
 @djadmin.register(UserProfile)
 class UserProfileAdmin(djadmin.ModelAdmin):
     list_display = ("user", "role", "organisation", "clearance_level", "can_approve_jorc", "can_approve_valmin")
+    list_select_related = ("user", "organisation")
     list_filter = ("role", "clearance_level", "can_approve_jorc", "can_approve_valmin", "organisation")
     search_fields = ("user__username", "user__email", "employee_id")
     readonly_fields = ("created_at", "updated_at")
@@ -90,6 +103,7 @@ class UserProfileAdmin(djadmin.ModelAdmin):
 @djadmin.register(AuditLog)
 class AuditLogAdmin(djadmin.ModelAdmin):
     list_display = ("user", "action", "content_type", "object_id", "timestamp", "ip_address")
+    list_select_related = ("user", "content_type")
     list_filter = ("action", "content_type", "timestamp")
     search_fields = ("user__username", "description", "object_id")
     readonly_fields = ("user", "action", "content_type", "object_id", "description", "ip_address", "user_agent", "timestamp")
@@ -104,6 +118,7 @@ class AuditLogAdmin(djadmin.ModelAdmin):
 @djadmin.register(ApprovalWorkflow)
 class ApprovalWorkflowAdmin(djadmin.ModelAdmin):
     list_display = ("workflow_type", "status", "content_type", "object_id", "submitted_by", "approved_by", "submitted_at")
+    list_select_related = ("content_type", "submitted_by", "approved_by")
     list_filter = ("workflow_type", "status", "submitted_at")
     search_fields = ("submission_notes", "approval_notes", "object_id")
     readonly_fields = ("submitted_at", "reviewed_at")
@@ -126,6 +141,7 @@ class ApprovalWorkflowAdmin(djadmin.ModelAdmin):
 @djadmin.register(SavedReport)
 class SavedReportAdmin(djadmin.ModelAdmin):
     list_display  = ("title", "process", "clearance_level", "created_by", "created_at", "updated_at")
+    list_select_related = ("process", "created_by")
     list_filter   = ("clearance_level", "process__organisation")
     search_fields = ("title", "process__name")
     readonly_fields = ("id", "created_at", "updated_at")
@@ -134,6 +150,7 @@ class SavedReportAdmin(djadmin.ModelAdmin):
 @djadmin.register(DocumentView)
 class DocumentViewAdmin(djadmin.ModelAdmin):
     list_display = ("user", "document", "viewed_at", "ip_address")
+    list_select_related = ("user", "document")
     list_filter = ("viewed_at",)
     search_fields = ("user__username", "document__title")
     readonly_fields = ("user", "document", "viewed_at", "ip_address")
@@ -149,6 +166,7 @@ class DocumentViewAdmin(djadmin.ModelAdmin):
 @djadmin.register(DocLink)
 class DocLinkAdmin(djadmin.ModelAdmin):
     list_display = ("document", "content_type", "object_id", "created_by", "created_at")
+    list_select_related = ("document", "content_type", "created_by")
     list_filter = ("content_type", "created_at")
     search_fields = ("document__title",)
     readonly_fields = ("created_at",)
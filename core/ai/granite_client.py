@@ -1,8 +1,20 @@
 import os
-import requests
+import json
 import logging
+from functools import lru_cache
 log = logging.getLogger(__name__)
 
+# connection pool sizing for the shared session; pool_maxsize bounds how many
+# concurrent requests to the model host can keep a warm connection
+POOL_CONNECTIONS = 16
+POOL_MAXSIZE = 64
+
+# transient model-host failures (restarts, overload) are retried with
+# exponential backoff before the caller falls back to the template report
+RETRY_TOTAL = 3
+RETRY_BACKOFF = 1.0
+RETRY_STATUSES = (502, 503, 504)
+
 class GraniteClient:
     """
     Minimal, backend-only caller. Backends:
@@ -27,24 +39,66 @@ class GraniteClient:
         else:
             raise ValueError("Unsupported GRANITE_BACKEND")
 
+        # requests is imported here rather than at module top so importing this
+        # module (e.g. on every manage.py start-up) stays cheap
+        import requests
+        from requests.adapters import HTTPAdapter
+        from urllib3.util import Retry
+
+        # one pooled session per client so TCP/TLS connections are reused
+        # across calls instead of being torn down after every request
+        self.session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=POOL_CONNECTIONS,
+            pool_maxsize=POOL_MAXSIZE,
+            max_retries=Retry(
+                total=RETRY_TOTAL,
+                backoff_factor=RETRY_BACKOFF,
+                status_forcelist=RETRY_STATUSES,
+                respect_retry_after_header=True,
+                # POST isn't retried by default; a generate call has no side effects
+                allowed_methods=frozenset({"POST"}),
+            ),
+        )
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
     def complete(self, prompt: str, max_new_tokens: int = 900):
+        # transient failures are retried in one place, the adapter's Retry: connection
+        # errors, timeouts before the response and 502/503/504. A read timeout
+        # mid-body surfaces from iter_lines as ConnectionError and is not retried
+        # again here, which would multiply the two budgets
+        return "".join(self.complete_stream(prompt, max_new_tokens=max_new_tokens))
+
+    def complete_stream(self, prompt: str, max_new_tokens: int = 900):
+        """
+        Yield generated text fragments as they arrive.
+
+        Ollama streams newline-delimited JSON chunks; the HF inference API
+        returns the whole generation at once, so it is yielded as one piece.
+        """
         if self.backend == "ollama":
             payload = {
                 "model": self.model,
                 "prompt": prompt,
                 "options": {"num_ctx": 8192},
-                "stream": False,
+                "stream": True,
             }
-            r = requests.post(self.url, json=payload, timeout=self.timeout)
-            r.raise_for_status()
-            data = r.json()
-            log.debug("Ollama response keys: %s", list(data.keys()))
-            log.debug("Ollama response text: %s", data.get("response", "")[:100])
-            result = data.get("response", "")
-            return data.get("response", "")
+            with self.session.post(self.url, json=payload, stream=True, timeout=self.timeout) as r:
+                r.raise_for_status()
+                for line in r.iter_lines(decode_unicode=True):
+                    if not line:
+                        continue
+                    chunk = json.loads(line)
+                    if chunk.get("error"):
+                        raise RuntimeError(chunk["error"])
+                    yield chunk.get("response", "")
+                    if chunk.get("done"):
+                        break
+            return
 
         headers = {"Authorization": f"Bearer {self.hf_token}"} if getattr(self, "hf_token", None) else {}
-        r = requests.post(
+        r = self.session.post(
             self.url,
             headers=headers,
             json={"inputs": prompt, "parameters": {"max_new_tokens": max_new_tokens}},
@@ -53,5 +107,18 @@ class GraniteClient:
         r.raise_for_status()
         out = r.json()
         if isinstance(out, list) and out:
-            return out[0].get("generated_text", "")
-        return str(out)
+            yield out[0].get("generated_text", "")
+        else:
+            yield str(out)
+
+
+def get_granite_client(backend: str | None = None) -> GraniteClient:
+    """
+    Process-wide GraniteClient per backend: config is read once and every caller
+    shares the same pooled session.
+    """
+    return _cached_client((backend or os.getenv("GRANITE_BACKEND", "ollama")).lower())
+
+@lru_cache(maxsize=4)
+def _cached_client(backend: str) -> GraniteClient:
+    return GraniteClient(backend)
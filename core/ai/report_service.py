@@ -1,15 +1,20 @@
 from __future__ import annotations
 import logging
-from datetime import datetime
-from typing import Iterable
+from concurrent.futures import ThreadPoolExecutor
+from operator import itemgetter
+from typing import TYPE_CHECKING, Iterable
 
-from django.db.models import QuerySet
-from django.utils.timezone import localtime
+from django.core.cache import cache
+from django.db import connections
+from django.db.models import Count, Max
+from django.utils import timezone
 
 from ..models import Process, Document, SavedReport, AuditLog, log_audit
-from .granite_client import GraniteClient
 from .retrieval import retrieve_context
 
+if TYPE_CHECKING:
+    from .granite_client import GraniteClient
+
 log = logging.getLogger(__name__)
 
 # clearance hierarchy — mirrors UserProfile.ClearanceLevel and retrieval.py
@@ -28,54 +33,72 @@ CONFIDENTIALITY_MAP = {
     "jorc_restricted": 3,
 }
 
-def _fmt_dt(dt):
-    if not dt:
-        return ""
-    try:
-        return localtime(dt).strftime("%Y-%m-%d %H:%M")
-    except Exception:
-        return str(dt)
-
-def _fmt_user(user):
-    if not user:
-        return ""
-    return getattr(user, "username", str(user))
-
-def fetch_process_bundle(process_id: str, clearance_level: str = "INTERNAL") -> dict:
+# generated reports are keyed on a content fingerprint, so a long TTL is safe:
+# any document/process edit changes the key rather than serving stale text
+REPORT_CACHE_TTL = 86400  # 24 hours
+
+def _fmt_dt(dt, tz):
+    return dt.astimezone(tz).strftime("%Y-%m-%d %H:%M") if dt else ""
+
+# columns pulled for each context row, in the order _DOC_ROW_TEMPLATE uses them
+_DOC_ROW_FIELDS = (
+    "id",
+    "title",
+    "timestamp",
+    "doc_type",
+    "created_by__username",
+    "confidentiality",
+    "created_at",
+    "file",
+    "checksum_sha256",
+    "extracted_text",
+)
+_doc_row = itemgetter(*_DOC_ROW_FIELDS)
+_DOC_ROW_TEMPLATE = (
+    "  - {id: %s, title: %r, date: %s, type: %s, uploaded_by: %s, conf: %s, "
+    "created_at: %s, file: %s, checksum: %s, text_snippet: %r}"
+)
+
+def _accessible_documents(proc: Process, clearance_level: str):
     """
-    Fetch the project (Process) and a clearance-filtered slice of related documents.
-
-    Only documents whose confidentiality level is accessible to the caller's
-    clearance_level are included.  This prevents higher-clearance content from
+    Documents on this process whose confidentiality level is accessible to the
+    caller's clearance_level.  This prevents higher-clearance content from
     appearing in reports cached for lower-clearance users.
     """
-    proc = Process.objects.select_related("organisation").get(pk=process_id)
-
     user_level = CLEARANCE_LEVELS.get(clearance_level, 1)
     accessible_confidentiality = [
         conf for conf, level in CONFIDENTIALITY_MAP.items()
         if level <= user_level
     ]
+    return Document.objects.filter(process=proc, confidentiality__in=accessible_confidentiality)
 
-    docs: QuerySet[Document] = (
-        Document.objects
-        .filter(process=proc, confidentiality__in=accessible_confidentiality)
-        .select_related("created_by", "organisation", "process")
-        .order_by("-timestamp", "-created_at")[:50]
-        .only(
-            "id",
-            "title",
-            "timestamp",
-            "doc_type",
-            "confidentiality",
-            "file",
-            "created_at",
-            "checksum_sha256",
-            "extracted_text",
-            "created_by__username",
-            "organisation__name",
-            "process__name",
-        )
+def fetch_process_stats(process_id: str, clearance_level: str = "INTERNAL") -> dict:
+    """
+    Fetch the project (Process) plus a one-row aggregate over its accessible
+    documents: count `n` and newest `last` updated_at.
+
+    Enough for cache fingerprinting and the fallback report without pulling
+    the document rows themselves.
+    """
+    proc = Process.objects.select_related("organisation").get(pk=process_id)
+    stats = _accessible_documents(proc, clearance_level).aggregate(n=Count("id"), last=Max("updated_at"))
+    return {"process": proc, **stats}
+
+def fetch_process_bundle(process_id: str, clearance_level: str = "INTERNAL", proc: Process | None = None) -> dict:
+    """
+    Fetch the project (Process) and a clearance-filtered slice of related documents.
+
+    Pass `proc` if the Process has already been loaded to skip refetching it.
+    """
+    if proc is None:
+        proc = Process.objects.select_related("organisation").get(pk=process_id)
+
+    # plain dicts rather than model instances: the context builder only reads
+    # scalar columns, so skip per-row model construction entirely
+    docs = (
+        _accessible_documents(proc, clearance_level)
+        .order_by("-timestamp", "-created_at")
+        .values(*_DOC_ROW_FIELDS)[:50]
     )
 
     return {
@@ -88,51 +111,58 @@ def build_structured_context(bundle: dict) -> str:
     Convert DB records into a compact, LLM-friendly context block.
     """
     p: Process = bundle["process"]
-    lines = []
-    lines.append("PROCESS")
-    lines.append(f"  id: {p.id}")
-    lines.append(f"  name: {p.name or ''}")
-    lines.append(f"  mode: {p.mode}")
-    lines.append(f"  commodity: {p.commodity or ''}")
-    lines.append(f"  organisation: {p.organisation.name if p.organisation else ''}")
-    lines.append("")
-
-    lines.append("DOCUMENTS (latest up to 50)")
-    for d in bundle["docs"]:
-        snippet = (d.extracted_text or "")[:1000].replace("\n", " ").strip()
-
-        lines.append(
-            "  - {"
-            f"id: {d.id}, "
-            f"title: {d.title!r}, "
-            f"date: {d.timestamp or ''}, "
-            f"type: {d.doc_type or ''}, "
-            f"uploaded_by: {_fmt_user(d.created_by)}, "
-            f"conf: {d.confidentiality or ''}, "
-            f"created_at: {_fmt_dt(d.created_at)}, "
-            f"file: {getattr(d.file, 'name', '')}, "
-            f"checksum: {d.checksum_sha256 or ''}, "
-            f"text_snippet: {snippet!r}"
-            "}"
+    tz = timezone.get_current_timezone()  # resolved once, not per row
+
+    header = (
+        "PROCESS\n"
+        f"  id: {p.id}\n"
+        f"  name: {p.name or ''}\n"
+        f"  mode: {p.mode}\n"
+        f"  commodity: {p.commodity or ''}\n"
+        f"  organisation: {p.organisation.name if p.organisation else ''}\n"
+        "\n"
+        "DOCUMENTS (latest up to 50)"
+    )
+    # one C-level tuple fetch + one %-format per row
+    body = "\n".join(
+        _DOC_ROW_TEMPLATE % (
+            doc_id,
+            title,
+            date or "",
+            doc_type or "",
+            username or "",
+            conf or "",
+            _fmt_dt(created_at, tz),
+            file or "",
+            checksum or "",
+            (text or "")[:1000].replace("\n", " ").strip(),
         )
+        for doc_id, title, date, doc_type, username, conf, created_at, file, checksum, text
+        in map(_doc_row, bundle["docs"])
+    )
 
-    return "\n".join(lines)
+    return f"{header}\n{body}" if body else header
 
 REPORT_SYSTEM_INSTRUCTIONS = """You are a technical writer generating concise mining/exploration project reports.
 Write clearly and factually, using only the provided context. If data is missing, say so briefly.
 Output Markdown. Keep it structured with headings.
 Audience: internal stakeholders (technical + managerial)."""
 
-def build_prompt(context: str, as_of: str | None = None, sections: Iterable[str] | None = None) -> str:
-    sections = sections or [
-        "1. Project Summary",
-        "2. Key Documents & Evidence",
-        "3. Activities Timeline",
-        "4. Commodities & Targets",
-        "5. Data Gaps & Next Steps",
-    ]
-    as_of = as_of or datetime.utcnow().strftime("%Y-%m-%d")
-    return f"""{REPORT_SYSTEM_INSTRUCTIONS}
+_DEFAULT_SECTIONS = (
+    "1. Project Summary",
+    "2. Key Documents & Evidence",
+    "3. Activities Timeline",
+    "4. Commodities & Targets",
+    "5. Data Gaps & Next Steps",
+)
+
+def _sections_block(sections: Iterable[str]) -> str:
+    return "\n".join(f"- {s}" for s in sections)
+
+_DEFAULT_SECTIONS_BLOCK = _sections_block(_DEFAULT_SECTIONS)
+
+# everything static is baked in at import; build_prompt only fills the slots
+PROMPT_TEMPLATE = REPORT_SYSTEM_INSTRUCTIONS + """
 
 DATE: {as_of}
 
@@ -143,7 +173,7 @@ TASK:
 Generate a succinct, well-structured Markdown report for the project above.
 Use the following section outline (omit any section with no information):
 
-{chr(10).join(f"- {s}" for s in sections)}
+{sections_block}
 
 Style:
 - Bullet points where helpful.
@@ -151,14 +181,25 @@ Style:
 - Keep to ~400–700 words.
 """
 
-def generate_project_report(process_id: str, clearance_level: str = "INTERNAL") -> str:
+def build_prompt(context: str, as_of: str | None = None, sections: Iterable[str] | None = None) -> str:
+    sections_block = _sections_block(sections) if sections else _DEFAULT_SECTIONS_BLOCK
+    as_of = as_of or timezone.now().date().isoformat()  # aware UTC, same day as utcnow()
+    return PROMPT_TEMPLATE.format(as_of=as_of, context=context, sections_block=sections_block)
+
+def _report_cache_key(process_id: str, clearance_level: str, stats: dict) -> str:
     """
-    Orchestrates: fetch → structure → call Granite → return Markdown.
+    Fingerprint = newest updated_at across the process and its documents, plus
+    the document count, so edits, uploads and deletions all miss the cache.
+    `stats` is the dict returned by fetch_process_stats.
+    """
+    p = stats["process"]
+    last = max(ts for ts in (p.updated_at, stats["last"]) if ts)
+    return f"report:v2:{process_id}:{clearance_level}:{last.isoformat()}:{stats['n']}"
 
-    Only documents and chunks accessible at clearance_level are included,
-    ensuring cached reports are correctly scoped per clearance tier.
+def _build_report_prompt(bundle: dict, clearance_level: str) -> str:
+    """
+    structure → prompt: turn a fetched bundle into the finished Granite prompt.
     """
-    bundle = fetch_process_bundle(process_id, clearance_level=clearance_level)
     p = bundle["process"]
 
     # Structured metadata context
@@ -173,25 +214,123 @@ def generate_project_report(process_id: str, clearance_level: str = "INTERNAL")
     )
 
     full_context = f"{metadata_ctx}\n\nDOCUMENT CONTENT EXCERPTS:\n{content_ctx}"
-    prompt = build_prompt(full_context)
+    return build_prompt(full_context)
 
-    client = GraniteClient()
-    try:
-        text = client.complete(prompt)
-        return text
-    except Exception as e:
-        log.error("Granite call failed for process %s: %s", process_id, e, exc_info=True)
-        return f"""# {p.name or "Project"} - Auto Report (Fallback)
+def _fallback_report(p: Process, doc_count: int) -> str:
+    return f"""# {p.name or "Project"} - Auto Report (Fallback)
 
 Granite unavailable. Minimal context below:
 
 - Mode: {p.mode}
 - Commodity: {p.commodity or "n/a"}
-- Documents: {len(bundle["docs"])}
+- Documents: {doc_count}
 
 You can retry when the model service is reachable.
 """
 
+def generate_project_report(
+    process_id: str,
+    clearance_level: str = "INTERNAL",
+    client: GraniteClient | None = None,
+    force: bool = False,
+) -> str:
+    """
+    Orchestrates: fetch → structure → call Granite → return Markdown.
+
+    Only documents and chunks accessible at clearance_level are included,
+    ensuring cached reports are correctly scoped per clearance tier.
+    Results are cached per content fingerprint; pass `force=True` to bypass
+    the cache and regenerate. Pass `client` to reuse an existing
+    GraniteClient (and its session).
+    """
+    stats = fetch_process_stats(process_id, clearance_level=clearance_level)
+    cache_key = _report_cache_key(process_id, clearance_level, stats)
+    if not force:
+        cached = cache.get(cache_key)
+        if cached is not None:
+            return cached
+
+    # only pull the document slice once we know we actually need a prompt
+    bundle = fetch_process_bundle(process_id, clearance_level=clearance_level, proc=stats["process"])
+    prompt = _build_report_prompt(bundle, clearance_level)
+
+    if client is None:
+        # deferred: a cache hit above never needs the client module
+        from .granite_client import get_granite_client
+        client = get_granite_client()
+    try:
+        text = client.complete(prompt)
+    except Exception as e:
+        log.error("Granite call failed for process %s: %s", process_id, e, exc_info=True)
+        # not cached, so the next request retries the model
+        return _fallback_report(stats["process"], stats["n"])
+
+    cache.set(cache_key, text, REPORT_CACHE_TTL)
+    return text
+
+def generate_reports_bulk(
+    process_ids: list[str],
+    clearance_level: str = "INTERNAL",
+    max_workers: int = 8,
+) -> dict[str, str]:
+    """
+    Generate reports for many processes concurrently.
+
+    Granite calls are I/O-bound, so a thread pool sharing one client (and so
+    one requests.Session pool) scales close to linearly up to the pool size.
+    Returns {process_id: markdown}.
+    """
+    from .granite_client import get_granite_client
+
+    client = get_granite_client()
+
+    def _one(process_id):
+        try:
+            return generate_project_report(process_id, clearance_level=clearance_level, client=client)
+        finally:
+            # each worker thread gets its own DB connection; don't leak them
+            connections.close_all()
+
+    ids = [str(pid) for pid in process_ids]
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        return dict(zip(ids, pool.map(_one, ids)))
+
+def stream_project_report(process_id: str, clearance_level: str = "INTERNAL"):
+    """
+    Streaming variant of generate_project_report: yields Markdown fragments
+    as Granite produces them, so callers can forward them to the client.
+
+    A cached report is yielded whole. A completed stream is cached for later
+    non-streaming requests. Falls back to the minimal report if the model
+    fails before emitting anything; a failure mid-stream just ends the stream.
+    """
+    stats = fetch_process_stats(process_id, clearance_level=clearance_level)
+    cache_key = _report_cache_key(process_id, clearance_level, stats)
+    cached = cache.get(cache_key)
+    if cached is not None:
+        yield cached
+        return
+
+    bundle = fetch_process_bundle(process_id, clearance_level=clearance_level, proc=stats["process"])
+    prompt = _build_report_prompt(bundle, clearance_level)
+
+    from .granite_client import get_granite_client
+
+    client = get_granite_client()
+    parts = []
+    try:
+        for fragment in client.complete_stream(prompt):
+            if fragment:
+                parts.append(fragment)
+                yield fragment
+    except Exception as e:
+        log.error("Granite stream failed for process %s: %s", process_id, e, exc_info=True)
+        if not parts:
+            yield _fallback_report(stats["process"], stats["n"])
+        return
+
+    cache.set(cache_key, "".join(parts), REPORT_CACHE_TTL)
+
 def save_report(process, organisation, title, content_md, user, reason="GENERATED", summary=""):
     import hashlib
     content_hash = hashlib.sha256(content_md.encode()).hexdigest()
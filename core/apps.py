@@ -8,9 +8,21 @@ class CoreConfig(AppConfig):
     name = "core"
 
     def ready(self):
+        from django.db.models.signals import post_migrate
+
+        # content type rows may be recreated by migrate/flush (e.g. between
+        # TransactionTestCases), so drop the cached audit content types
+        post_migrate.connect(_reset_audit_content_types, dispatch_uid="core_reset_audit_cts")
+
         # avoid re-calling the setup handler if we are the watcher (i.e. parent) process;
         # reloader only sets RUN_MAIN=true in child process
         if os.environ.get("RUN_MAIN") == "true":
             from core.telemetry import Telemetry
 
             Telemetry().setup()
+
+
+def _reset_audit_content_types(**kwargs):
+    from core.models import _CT_BY_MODEL
+
+    _CT_BY_MODEL.clear()
@@ -1,16 +1,33 @@
+import datetime
+
 from django import forms
 from django.forms import ModelForm
 from .models import Document, Process, Prospect
 from .tagging import TAG_CHOICES
 
+DATE_INPUT_FORMATS = (
+    "%Y-%m-%d",   # 2025-10-12  (default, ISO)
+    "%d/%m/%Y",   # 12/10/2025
+    "%d-%m-%Y",   # 12-10-2025
+)
+
+class ISODateField(forms.DateField):
+    """
+    DateField that tries date.fromisoformat before the strptime loop.
+    The HTML5 date picker always posts ISO, so the common case skips strptime.
+    """
+    def to_python(self, value):
+        if isinstance(value, str):
+            try:
+                return datetime.date.fromisoformat(value.strip())
+            except ValueError:
+                pass
+        return super().to_python(value)
+
 class DocumentForm(ModelForm):
-    timestamp = forms.DateField(
+    timestamp = ISODateField(
         required=False,
-        input_formats=[
-            "%Y-%m-%d",   # 2025-10-12  (default, ISO)
-            "%d/%m/%Y",   # 12/10/2025
-            "%d-%m-%Y",   # 12-10-2025
-        ],
+        input_formats=DATE_INPUT_FORMATS,
         widget=forms.DateInput(attrs={"type": "date"}), # HTML5 picker
         label="Date"
     )
@@ -37,11 +54,36 @@ class DocumentForm(ModelForm):
 
     def save(self, commit=True):
         obj = super().save(commit=False)
-        obj.tags = list(map(int, self.cleaned_data.get("tags", [])))
+        # TypedMultipleChoiceField has already validated and coerced to int
+        obj.tags = list(self.cleaned_data.get("tags") or [])
         if commit:
             obj.save()
         return obj
 
+class DocumentMetadataForm(DocumentForm):
+    """
+    DocumentForm without the file: checked when a direct upload asks for a
+    presigned URL, so a bad title or process is reported before any bytes go
+    to MinIO.
+    """
+    class Meta(DocumentForm.Meta):
+        fields = [f for f in DocumentForm.Meta.fields if f != "file"]
+
+class DirectUploadForm(DocumentMetadataForm):
+    """
+    DocumentForm for files already PUT to MinIO via a presigned URL.
+    The browser sends the object key, and its SHA-256 when it could hash the
+    file, instead of the file bytes. The server re-hashes the object either way.
+    """
+    s3_key = forms.CharField(max_length=255)
+    checksum_sha256 = forms.RegexField(regex=r"^[0-9a-f]{64}$", max_length=64, required=False)
+
+    def clean_s3_key(self):
+        key = self.cleaned_data["s3_key"]
+        if not key.startswith("docs/") or ".." in key:
+            raise forms.ValidationError("Invalid upload key.")
+        return key
+
 # ---- Search Form ------
  
 CONFIDENTIALITY_CHOICES = [
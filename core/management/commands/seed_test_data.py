@@ -11,6 +11,7 @@ from django.contrib.auth.models import Group, Permission
 from django.contrib.contenttypes.models import ContentType
 from django.contrib.gis.geos import MultiPolygon, Point, Polygon
 from django.core.management.base import BaseCommand
+from django.db import transaction
 from django.utils import timezone
 from faker import Faker
 from reportlab.lib import colors
@@ -38,6 +39,7 @@ from core.models import (
     Tenement,
     UserProfile,
 )
+from core.utils import sha256_file
 
 from .test_document_content import (
     compliance_content,
@@ -193,12 +195,9 @@ def random_multipolygon():
 
 
 def file_sha256(path: str) -> str:
-    """Compute SHA-256 of file on disk."""
-    h = hashlib.sha256()
+    """Compute SHA-256 of file on disk (same hashing path as uploads)."""
     with open(path, "rb") as f:
-        for chunk in iter(lambda: f.read(8192), b""):
-            h.update(chunk)
-    return h.hexdigest()
+        return sha256_file(f)
 
 
 def fake_sha256():
@@ -378,7 +377,7 @@ class Command(BaseCommand):
         holes = []
         for proc in processes:
             for i in range(NUM_DRILLHOLES_PER_PROCESS):
-                h = Drillhole.objects.create(
+                h = Drillhole(
                     id=uuid.uuid4(),
                     name=f"DH-{proc.name[:8].upper().replace(' ', '')}-{i + 1:03d}",
                     organisation=proc.organisation,
@@ -389,6 +388,7 @@ class Command(BaseCommand):
                     collar_location=random_point(),
                 )
                 holes.append(h)
+        Drillhole.objects.bulk_create(holes)
         self._log(f"created: {len(holes)} drillholes")
         return holes
 
@@ -423,7 +423,7 @@ class Command(BaseCommand):
                     f"maiden drilling programme. Secondary objective: assess metallurgical "
                     f"recovery potential for {commodity}."
                 )
-                pr = Prospect.objects.create(
+                pr = Prospect(
                     id=uuid.uuid4(),
                     name=f"{fake.last_name()} {random.choice(['Lode', 'Reef', 'Deposit', 'Zone'])}",
                     organisation=proc.organisation,
@@ -433,6 +433,7 @@ class Command(BaseCommand):
                     geom=random_point(),
                 )
                 prospects.append(pr)
+        Prospect.objects.bulk_create(prospects)
         self._log(f"created: {len(prospects)} prospects")
         return prospects
 
@@ -440,7 +441,7 @@ class Command(BaseCommand):
         tenements = []
         for proc in processes:
             for j in range(NUM_TENEMENTS_PER_PROCESS):
-                t = Tenement.objects.create(
+                t = Tenement(
                     id=uuid.uuid4(),
                     name=f"ML-{random.randint(1000, 9999)}/{random.randint(1, 99):02d}",
                     organisation=proc.organisation,
@@ -448,6 +449,7 @@ class Command(BaseCommand):
                     geom=random_multipolygon(),
                 )
                 tenements.append(t)
+        Tenement.objects.bulk_create(tenements)
         self._log(f"created: {len(tenements)} tenements")
         return tenements
 
@@ -528,9 +530,10 @@ class Command(BaseCommand):
 
     def _create_audit_logs(self, docs, users):
         ct = ContentType.objects.get_for_model(Document)
+        logs = []
         for _ in range(NUM_AUDIT_LOGS):
             doc = random.choice(docs)
-            AuditLog.objects.create(
+            logs.append(AuditLog(
                 action=random.choice(AUDIT_ACTIONS),
                 object_id=doc.id,
                 content_type=ct,
@@ -539,18 +542,21 @@ class Command(BaseCommand):
                 ip_address=fake.ipv4_private(),
                 user_agent=fake.user_agent(),
                 timestamp=timezone.now() - timedelta(days=random.randint(0, 90)),
-            )
+            ))
+        AuditLog.objects.bulk_create(logs)
 
         self._log("created: audit log entries")
 
     def _create_document_views(self, docs, users):
-        for _ in range(NUM_DOCUMENT_VIEWS):
-            DocumentView.objects.create(
+        DocumentView.objects.bulk_create([
+            DocumentView(
                 document=random.choice(docs),
                 user=random.choice(users),
                 viewed_at=timezone.now() - timedelta(days=random.randint(0, 30)),
                 ip_address=fake.ipv4_private(),
             )
+            for _ in range(NUM_DOCUMENT_VIEWS)
+        ])
         self._log("created: document views")
 
     def handle(self, *args, **options):
@@ -562,23 +568,28 @@ class Command(BaseCommand):
             self._flush()
             return
 
+        # groups first: _create_groups swallows per-group errors, which would
+        # otherwise leave the seeding transaction below unusable
         groups = self._create_groups()
-        orgs = self._create_organisations()
-        users = self._create_users(orgs, groups)
-        processes = self._create_processes(orgs)
-        drillholes = self._create_drillholes(processes)
-        prospects = self._create_prospects(processes)
-        tenements = self._create_tenements(processes)
-
-        if options["gen_pdf"]:
-            docs = self._create_documents(processes, users)
-
-            self._create_approval_workflows(docs, users)
-            self._create_audit_logs(docs, users)
-            self._create_document_views(docs, users)
-
-        else:
-            docs = []
+
+        # one transaction for the rest of the run: a single commit instead of one per row
+        with transaction.atomic():
+            orgs = self._create_organisations()
+            users = self._create_users(orgs, groups)
+            processes = self._create_processes(orgs)
+            drillholes = self._create_drillholes(processes)
+            prospects = self._create_prospects(processes)
+            tenements = self._create_tenements(processes)
+
+            if options["gen_pdf"]:
+                docs = self._create_documents(processes, users)
+
+                self._create_approval_workflows(docs, users)
+                self._create_audit_logs(docs, users)
+                self._create_document_views(docs, users)
+
+            else:
+                docs = []
 
         total = sum(
             [
@@ -17,6 +17,8 @@ from reportlab.platypus import (
     TableStyle,
 )
 
+from core.utils import sha256_file
+
 from . import constants
 from .pdf_generator import (
     compliance_content,
@@ -145,12 +147,9 @@ def random_multipolygon():
 
 
 def file_sha256(path: str) -> str:
-    """Compute SHA-256 of file on disk."""
-    h = hashlib.sha256()
+    """Compute SHA-256 of file on disk (same hashing path as uploads)."""
     with open(path, "rb") as f:
-        for chunk in iter(lambda: f.read(8192), b""):
-            h.update(chunk)
-    return h.hexdigest()
+        return sha256_file(f)
 
 
 def fake_sha256():
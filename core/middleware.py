@@ -0,0 +1,17 @@
+def _parse_client_ip(request):
+    # first hop of X-Forwarded-For when behind the proxy, else the socket peer
+    forwarded = request.META.get("HTTP_X_FORWARDED_FOR")
+    if forwarded:
+        return forwarded.split(",", 1)[0].strip()
+    return request.META.get("REMOTE_ADDR")
+
+
+class ClientIpMiddleware:
+    """Resolve the client IP once per request and expose it as request.client_ip."""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        request.client_ip = _parse_client_ip(request)
+        return self.get_response(request)
@@ -0,0 +1,16 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("core", "0016_document_process_ts_idx"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="document",
+            name="checksum_tree",
+            field=models.CharField(blank=True, default="", max_length=64),
+        ),
+    ]
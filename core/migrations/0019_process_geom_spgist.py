@@ -0,0 +1,23 @@
+import django.contrib.gis.db.models.fields
+import django.contrib.postgres.indexes
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("core", "0018_document_org_conf_idx"),
+    ]
+
+    operations = [
+        # drops the implicit GiST index on geom
+        migrations.AlterField(
+            model_name="process",
+            name="geom",
+            field=django.contrib.gis.db.models.fields.MultiPolygonField(blank=True, null=True, spatial_index=False, srid=4326),
+        ),
+        migrations.AddIndex(
+            model_name="process",
+            index=django.contrib.postgres.indexes.SpGistIndex(fields=["geom"], name="process_geom_spgist"),
+        ),
+    ]
@@ -0,0 +1,48 @@
+import django.contrib.postgres.indexes
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("core", "0019_process_geom_spgist"),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name="auditlog",
+            name="audit_logs_content_b0ef47_idx",
+        ),
+        migrations.RemoveIndex(
+            model_name="auditlog",
+            name="audit_logs_user_id_d685f3_idx",
+        ),
+        migrations.RemoveIndex(
+            model_name="auditlog",
+            name="audit_logs_timesta_423be6_idx",
+        ),
+        migrations.AddIndex(
+            model_name="auditlog",
+            index=models.Index(fields=["content_type", "object_id", "-timestamp"], name="audit_obj_ts"),
+        ),
+        migrations.AddIndex(
+            model_name="auditlog",
+            index=models.Index(fields=["user", "-timestamp"], name="audit_user_ts"),
+        ),
+        migrations.AddIndex(
+            model_name="auditlog",
+            index=django.contrib.postgres.indexes.BrinIndex(fields=["timestamp"], name="audit_ts_brin"),
+        ),
+        migrations.RemoveIndex(
+            model_name="documentview",
+            name="document_vi_viewed__659188_idx",
+        ),
+        migrations.AddIndex(
+            model_name="documentview",
+            index=models.Index(fields=["document", "-viewed_at"], name="docview_doc_ts"),
+        ),
+        migrations.AddIndex(
+            model_name="documentview",
+            index=django.contrib.postgres.indexes.BrinIndex(fields=["viewed_at"], name="docview_ts_brin"),
+        ),
+    ]
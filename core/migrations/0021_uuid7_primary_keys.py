@@ -0,0 +1,49 @@
+# Only the Python-side default changes: existing uuid4 rows keep their ids,
+# new rows get time-ordered uuid7 ids.
+import core.uuid7
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("core", "0020_auditlog_documentview_indexes"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="organisation",
+            name="id",
+            field=models.UUIDField(default=core.uuid7.uuid7, primary_key=True, serialize=False),
+        ),
+        migrations.AlterField(
+            model_name="process",
+            name="id",
+            field=models.UUIDField(default=core.uuid7.uuid7, primary_key=True, serialize=False),
+        ),
+        migrations.AlterField(
+            model_name="prospect",
+            name="id",
+            field=models.UUIDField(default=core.uuid7.uuid7, primary_key=True, serialize=False),
+        ),
+        migrations.AlterField(
+            model_name="tenement",
+            name="id",
+            field=models.UUIDField(default=core.uuid7.uuid7, primary_key=True, serialize=False),
+        ),
+        migrations.AlterField(
+            model_name="drillhole",
+            name="id",
+            field=models.UUIDField(default=core.uuid7.uuid7, primary_key=True, serialize=False),
+        ),
+        migrations.AlterField(
+            model_name="document",
+            name="id",
+            field=models.UUIDField(default=core.uuid7.uuid7, primary_key=True, serialize=False),
+        ),
+        migrations.AlterField(
+            model_name="savedreport",
+            name="id",
+            field=models.UUIDField(default=core.uuid7.uuid7, editable=False, primary_key=True, serialize=False),
+        ),
+    ]
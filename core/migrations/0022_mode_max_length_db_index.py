@@ -0,0 +1,31 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("core", "0021_uuid7_primary_keys"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="organisation",
+            name="mode",
+            field=models.CharField(
+                choices=[("EXPLORATION", "Exploration"), ("MINING", "Mining")],
+                db_index=True,
+                default="EXPLORATION",
+                max_length=16,
+            ),
+        ),
+        migrations.AlterField(
+            model_name="process",
+            name="mode",
+            field=models.CharField(
+                choices=[("PROJECT", "Project"), ("OPERATION", "Operation")],
+                db_index=True,
+                default="PROJECT",
+                max_length=16,
+            ),
+        ),
+    ]
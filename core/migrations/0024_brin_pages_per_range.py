@@ -0,0 +1,28 @@
+import django.contrib.postgres.indexes
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("core", "0023_document_tags_gin"),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name="auditlog",
+            name="audit_ts_brin",
+        ),
+        migrations.AddIndex(
+            model_name="auditlog",
+            index=django.contrib.postgres.indexes.BrinIndex(fields=["timestamp"], name="audit_ts_brin", pages_per_range=32),
+        ),
+        migrations.RemoveIndex(
+            model_name="documentview",
+            name="docview_ts_brin",
+        ),
+        migrations.AddIndex(
+            model_name="documentview",
+            index=django.contrib.postgres.indexes.BrinIndex(fields=["viewed_at"], name="docview_ts_brin", pages_per_range=32),
+        ),
+    ]
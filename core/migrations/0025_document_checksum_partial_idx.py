@@ -0,0 +1,54 @@
+from django.db import migrations, models
+from django.db.models import Count
+
+
+def check_duplicate_checksums(apps, schema_editor):
+    # fail with a readable message before any DDL rather than part-way through
+    # AddConstraint; rows with no organisation are distinct under this constraint
+    Document = apps.get_model("core", "Document")
+    dupes = list(
+        Document.objects.using(schema_editor.connection.alias)
+        .filter(organisation__isnull=False)
+        .exclude(checksum_sha256="")
+        .values("organisation_id", "checksum_sha256")
+        .annotate(n=Count("id"))
+        .filter(n__gt=1)[:5]
+    )
+    if dupes:
+        raise RuntimeError(
+            "core_document has documents sharing a checksum within one organisation "
+            f"(e.g. {dupes}); remove the duplicates before applying doc_sha_unique_per_org"
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("core", "0024_brin_pages_per_range"),
+    ]
+
+    operations = [
+        migrations.RunPython(check_duplicate_checksums, migrations.RunPython.noop),
+        # drop the full index on checksum_sha256 in favour of the partial one
+        migrations.AlterField(
+            model_name="document",
+            name="checksum_sha256",
+            field=models.CharField(blank=True, max_length=64),
+        ),
+        migrations.AddIndex(
+            model_name="document",
+            index=models.Index(
+                condition=models.Q(("checksum_sha256__gt", "")),
+                fields=["checksum_sha256"],
+                name="doc_sha_idx",
+            ),
+        ),
+        migrations.AddConstraint(
+            model_name="document",
+            constraint=models.UniqueConstraint(
+                condition=models.Q(("checksum_sha256__gt", "")),
+                fields=("organisation", "checksum_sha256"),
+                name="doc_sha_unique_per_org",
+            ),
+        ),
+    ]
@@ -0,0 +1,27 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("core", "0025_document_checksum_partial_idx"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="document",
+            index=models.Index(fields=["-created_at", "id"], name="doc_created_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="document",
+            index=models.Index(fields=["organisation", "-created_at"], name="doc_org_created_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="process",
+            index=models.Index(fields=["organisation", "-created_at"], name="proc_org_created_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="process",
+            index=models.Index(fields=["-created_at", "id"], name="proc_created_idx"),
+        ),
+    ]
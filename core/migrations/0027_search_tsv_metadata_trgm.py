@@ -0,0 +1,68 @@
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.operations import TrigramExtension
+from django.db import migrations
+
+
+TSV_FUNCTION = """
+    CREATE OR REPLACE FUNCTION core_document_tsv_update()
+    RETURNS trigger LANGUAGE plpgsql AS $$
+    BEGIN
+        NEW.search_tsv :=
+            setweight(to_tsvector('english', coalesce(NEW.title, '')), 'A') ||
+            setweight(to_tsvector('english', coalesce(NEW.extracted_text, '')), 'B') ||
+            setweight(to_tsvector('english', coalesce(NEW.doc_type, '')), 'C') ||
+            setweight(to_tsvector('english', coalesce(NEW.confidentiality, '')), 'D');
+        RETURN NEW;
+    END;
+    $$;
+"""
+
+# version from 0014, restored on reverse
+OLD_TSV_FUNCTION = """
+    CREATE OR REPLACE FUNCTION core_document_tsv_update()
+    RETURNS trigger LANGUAGE plpgsql AS $$
+    BEGIN
+        NEW.search_tsv :=
+            setweight(to_tsvector('english', coalesce(NEW.title, '')), 'A') ||
+            setweight(to_tsvector('english', coalesce(NEW.extracted_text, '')), 'B');
+        RETURN NEW;
+    END;
+    $$;
+"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("core", "0026_created_at_indexes"),
+    ]
+
+    operations = [
+        # 1. doc_type / confidentiality move into search_tsv so the document
+        #    search no longer needs ILIKE on core_document itself
+        migrations.RunSQL(sql=TSV_FUNCTION, reverse_sql=OLD_TSV_FUNCTION),
+
+        # 2. Backfill existing rows with the new vector
+        migrations.RunSQL(
+            sql="""
+                UPDATE core_document
+                SET search_tsv =
+                    setweight(to_tsvector('english', coalesce(title, '')), 'A') ||
+                    setweight(to_tsvector('english', coalesce(extracted_text, '')), 'B') ||
+                    setweight(to_tsvector('english', coalesce(doc_type, '')), 'C') ||
+                    setweight(to_tsvector('english', coalesce(confidentiality, '')), 'D');
+            """,
+            reverse_sql=migrations.RunSQL.noop,
+        ),
+
+        # 3. Trigram indexes for the project / organisation name matches
+        TrigramExtension(),
+        migrations.AddIndex(
+            model_name="organisation",
+            index=GinIndex(fields=["name"], name="org_name_trgm", opclasses=["gin_trgm_ops"]),
+        ),
+        migrations.AddIndex(
+            model_name="process",
+            index=GinIndex(fields=["name"], name="proc_name_trgm", opclasses=["gin_trgm_ops"]),
+        ),
+    ]
@@ -0,0 +1,24 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("core", "0027_search_tsv_metadata_trgm"),
+    ]
+
+    operations = [
+        # same keys as 0026, now covering title for index-only "recent" lists
+        migrations.RemoveIndex(model_name="document", name="doc_created_idx"),
+        migrations.RemoveIndex(model_name="document", name="doc_org_created_idx"),
+        migrations.AddIndex(
+            model_name="document",
+            index=models.Index(fields=["-created_at", "id"], include=["title"], name="doc_created_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="document",
+            index=models.Index(
+                fields=["organisation", "-created_at"], include=["id", "title"], name="doc_org_created_idx"
+            ),
+        ),
+    ]
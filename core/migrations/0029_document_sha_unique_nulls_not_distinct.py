@@ -0,0 +1,41 @@
+from django.db import migrations, models
+from django.db.models import Count
+
+
+def check_unowned_duplicates(apps, schema_editor):
+    # the NULLS NOT DISTINCT constraint only adds the organisation-less rows
+    Document = apps.get_model("core", "Document")
+    dupes = list(
+        Document.objects.using(schema_editor.connection.alias)
+        .filter(organisation__isnull=True)
+        .exclude(checksum_sha256="")
+        .values("checksum_sha256")
+        .annotate(n=Count("id"))
+        .filter(n__gt=1)[:5]
+    )
+    if dupes:
+        raise RuntimeError(
+            "core_document has documents without an organisation sharing a checksum "
+            f"(e.g. {dupes}); remove the duplicates before applying doc_sha_unique_per_org"
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("core", "0028_document_created_covering_idx"),
+    ]
+
+    operations = [
+        migrations.RunPython(check_unowned_duplicates, migrations.RunPython.noop),
+        migrations.RemoveConstraint(model_name="document", name="doc_sha_unique_per_org"),
+        migrations.AddConstraint(
+            model_name="document",
+            constraint=models.UniqueConstraint(
+                condition=models.Q(("checksum_sha256__gt", "")),
+                fields=("organisation", "checksum_sha256"),
+                name="doc_sha_unique_per_org",
+                nulls_distinct=False,
+            ),
+        ),
+    ]
@@ -1,77 +1,134 @@
 # from django.utils import timezone
-import uuid
+from functools import cache
 
 from django.conf import settings
-from django.contrib.auth.models import User
 from django.contrib.contenttypes.fields import GenericForeignKey
 from django.contrib.contenttypes.models import ContentType
 from django.contrib.gis.db import models
 from django.contrib.postgres.fields import ArrayField
+from django.contrib.postgres.indexes import BrinIndex, GinIndex, SpGistIndex
 from django.contrib.postgres.search import SearchVectorField
 from django.core.exceptions import ValidationError
-from django.db.models.signals import post_save
+from django.db import connection
+from django.core.cache import cache as django_cache
+from django.db.models.signals import post_delete, post_save
 from django.dispatch import receiver
 from django.utils.translation import gettext_lazy as _
 
+from .uuid7 import uuid7
+
+
+def choice_constraint(field_name, choices, name):
+    """
+    CHECK constraint limiting `field_name` to the values of `choices`, so the
+    DB rule is generated from the same TextChoices the model validates against
+    """
+    return models.CheckConstraint(
+        check=models.Q(**{f"{field_name}__in": [value for value, _label in choices]}),
+        name=name,
+    )
+
 
 class ChoiceValidationMixin:
     """
     Automatically handle validation of choice fields
     """
 
+    @classmethod
+    @cache
+    def _choice_field_map(cls) -> dict[str, frozenset]:
+        # choices are class-level, so build the lookup sets once per model class
+        return {
+            field.name: frozenset(value for value, _label in field.flatchoices)
+            for field in cls._meta.fields
+            if field.choices
+        }
+
     def clean(self):
         super().clean()
-        for field in self._meta.fields:
-            if field.choices:
-                field_value = getattr(self, field.name)
-                valid_choices = [choice[0] for choice in field.choices]
-                if field_value not in valid_choices:
-                    raise ValidationError(
-                        {
-                            field.name: f"invalid value for {field.name}"
-                            f"(expected one of {valid_choices})"
-                        }
-                    )
+        for name, valid_choices in self._choice_field_map().items():
+            field_value = getattr(self, name)
+            if field_value not in valid_choices:
+                raise ValidationError(
+                    {
+                        name: f"invalid value for {name}"
+                        f"(expected one of {sorted(valid_choices)})"
+                    }
+                )
 
 
 class AutoCleanMixin:
     """
     Override `save()` method to run `full_clean()` prior to calling `save()`
+
+    Pass `skip_clean=True` for callers that have already validated, or set
+    `AUTO_CLEAN = False` on a subclass to make validation opt-in. Uniqueness
+    and Meta.constraints are left to the database rather than a SELECT per
+    save: the choice CHECKs are already covered in Python by clean().
     """
 
+    AUTO_CLEAN = True
+
     def save(self, *args, **kwargs):
-        self.full_clean()
+        if not kwargs.pop("skip_clean", not self.AUTO_CLEAN):
+            self.full_clean(exclude=["id"], validate_unique=False, validate_constraints=False)
         super().save(*args, **kwargs)
 
 
+class ValidatedChoiceManager(models.Manager):
+    """
+    Manager whose `bulk_create()` runs the cached choice validation per object
+    before one batched INSERT, instead of a full `save()` per row
+    """
+
+    def bulk_create(self, objs, *args, validate=True, **kwargs):
+        objs = list(objs)
+        if validate:
+            for obj in objs:
+                obj.clean()
+        return super().bulk_create(objs, *args, **kwargs)
+
+
 class ValidatedChoiceModel(ChoiceValidationMixin, AutoCleanMixin, models.Model):
     """
     Abstract base Model to handle automatic choice validation
     """
 
+    objects = ValidatedChoiceManager()
+
     class Meta:
         abstract = True
 
 
+# choice classes live at module level so Meta.constraints can reference them
+class OrganisationMode(models.TextChoices):
+    EXPLORATION = "EXPLORATION", _("Exploration")
+    MINING = "MINING", _("Mining")
+
+
+class ProcessType(models.TextChoices):
+    PROJECT = "PROJECT", _("Project")
+    OPERATION = "OPERATION", _("Operation")
+
+
 # class Organisation(models.Model):
 class Organisation(ValidatedChoiceModel):
-    class Mode(models.TextChoices):
-        EXPLORATION = "EXPLORATION", _("Exploration")
-        MINING = "MINING", _("Mining")
+    Mode = OrganisationMode
 
-    id = models.UUIDField(primary_key=True, default=uuid.uuid4, unique=True, null=False)
+    id = models.UUIDField(primary_key=True, default=uuid7)
     name = models.CharField(max_length=32, null=True)
-    mode = models.CharField(choices=Mode, default=Mode.EXPLORATION)
+    mode = models.CharField(max_length=16, choices=Mode, default=Mode.EXPLORATION, db_index=True)
 
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
     class Meta:
         constraints = [
-            models.CheckConstraint(
-                check=models.Q(mode__in=["EXPLORATION", "MINING"]),
-                name="valid_organisation_mode",
-            )
+            choice_constraint("mode", OrganisationMode.choices, "valid_organisation_mode"),
+        ]
+        indexes = [
+            # name__icontains lookups from the document search
+            GinIndex(fields=["name"], name="org_name_trgm", opclasses=["gin_trgm_ops"]),
         ]
 
     def __str__(self):
@@ -85,16 +142,16 @@ class Organisation(ValidatedChoiceModel):
 #  I feel like this is better named something like 'Campaign' or 'Activity' for
 #  the sake of clarity
 class Process(ValidatedChoiceModel):
-    class ProcessType(models.TextChoices):
-        PROJECT = "PROJECT", _("Project")
-        OPERATION = "OPERATION", _("Operation")
+    ProcessType = ProcessType
 
-    id = models.UUIDField(primary_key=True, default=uuid.uuid4, unique=True, null=False)
+    id = models.UUIDField(primary_key=True, default=uuid7)
     name = models.CharField(max_length=64, null=True)
     organisation = models.ForeignKey(Organisation, on_delete=models.CASCADE, null=True, blank=True)
-    mode = models.CharField(choices=ProcessType, default=ProcessType.PROJECT)
+    mode = models.CharField(max_length=16, choices=ProcessType, default=ProcessType.PROJECT, db_index=True)
 
-    geom = models.MultiPolygonField(srid=4326, null=True, blank=True)
+    # indexed with SP-GiST in Meta instead of the default GiST (smaller, faster
+    # for overlapping tenement/project polygons; needs PostGIS >= 2.5)
+    geom = models.MultiPolygonField(srid=4326, null=True, blank=True, spatial_index=False)
     commodity = models.CharField(max_length=64, blank=True, null=True)
 
     created_at = models.DateTimeField(auto_now_add=True)
@@ -102,10 +159,15 @@ class Process(ValidatedChoiceModel):
 
     class Meta:
         constraints = [
-            models.CheckConstraint(
-                check=models.Q(mode__in=["PROJECT", "OPERATION"]),
-                name="valid_process_mode",
-            )
+            choice_constraint("mode", ProcessType.choices, "valid_process_mode"),
+        ]
+        indexes = [
+            SpGistIndex(fields=["geom"], name="process_geom_spgist"),
+            # name__icontains lookups from the document search
+            GinIndex(fields=["name"], name="proc_name_trgm", opclasses=["gin_trgm_ops"]),
+            # newest-first lists (home / AI insights), per organisation and overall
+            models.Index(fields=["organisation", "-created_at"], name="proc_org_created_idx"),
+            models.Index(fields=["-created_at", "id"], name="proc_created_idx"),
         ]
 
     def __str__(self):
@@ -113,14 +175,14 @@ class Process(ValidatedChoiceModel):
 
     def __repr__(self):
         return (
-            f"Process(id={self.id},name={self.name},organisation={self.organisation},"
+            f"Process(id={self.id},name={self.name},organisation_id={self.organisation_id},"
             f"mode={self.mode},geom={self.geom},commodity={self.commodity},"
             f"created_at={self.created_at},updated_at={self.updated_at})"
         )
 
 
 class Prospect(models.Model):
-    id = models.UUIDField(primary_key=True, default=uuid.uuid4, unique=True, null=False)
+    id = models.UUIDField(primary_key=True, default=uuid7)
     name = models.CharField(max_length=64, null=False)
     organisation = models.ForeignKey(Organisation, on_delete=models.CASCADE)
     process = models.ForeignKey(Process, on_delete=models.CASCADE)
@@ -154,13 +216,13 @@ class Prospect(models.Model):
 
     def __repr__(self):
         return (
-            f"Prospect(id={self.id},name={self.name},organisation={self.organisation},"
-            f"process={self.process},created_at={self.created_at},updated_at={self.updated_at})"
+            f"Prospect(id={self.id},name={self.name},organisation_id={self.organisation_id},"
+            f"process_id={self.process_id},created_at={self.created_at},updated_at={self.updated_at})"
         )
 
 
 class Tenement(models.Model):
-    id = models.UUIDField(primary_key=True, default=uuid.uuid4, unique=True, null=False)
+    id = models.UUIDField(primary_key=True, default=uuid7)
     name = models.CharField(max_length=64, null=False)
     organisation = models.ForeignKey(Organisation, on_delete=models.CASCADE)
     process = models.ForeignKey(Process, on_delete=models.CASCADE)
@@ -173,13 +235,13 @@ class Tenement(models.Model):
 
     def __repr__(self):
         return (
-            f"Tenement(id={self.id},name={self.name},organisation={self.organisation},"
-            f"process={self.process},created_at={self.created_at},updated_at={self.updated_at}"
+            f"Tenement(id={self.id},name={self.name},organisation_id={self.organisation_id},"
+            f"process_id={self.process_id},created_at={self.created_at},updated_at={self.updated_at})"
         )
 
 
 class Drillhole(models.Model):
-    id = models.UUIDField(primary_key=True, default=uuid.uuid4, unique=True, null=False)
+    id = models.UUIDField(primary_key=True, default=uuid7)
     name = models.CharField(max_length=64, null=False)
     organisation = models.ForeignKey(Organisation, on_delete=models.CASCADE)
     process = models.ForeignKey(Process, on_delete=models.CASCADE)
@@ -197,13 +259,38 @@ class Drillhole(models.Model):
 
     def __repr__(self):
         return (
-            f"Drillholed(id={self.id},name={self.name},organisation={self.organisation},"
-            f"process={self.process},created_at={self.created_at},updated_at={self.updated_at}"
+            f"Drillhole(id={self.id},name={self.name},organisation_id={self.organisation_id},"
+            f"process_id={self.process_id},created_at={self.created_at},updated_at={self.updated_at})"
+        )
+
+
+class DocumentQuerySet(models.QuerySet):
+    def accessible_to(self, user):
+        """
+        SQL version of UserProfile.can_access_document: documents with no
+        organisation or the user's organisation, at or below their clearance.
+        Superusers see everything; users without a profile see nothing.
+        """
+        if user.is_superuser:
+            return self
+        profile = getattr(user, "profile", None)
+        if profile is None:
+            return self.none()
+        # same rules as can_access_document: case-insensitive, blank or unknown -> internal
+        doc_rank = models.Case(
+            *(models.When(confidentiality__iexact=conf, then=models.Value(rank)) for conf, rank in _DOC_RANK.items()),
+            default=models.Value(_DOC_RANK["internal"]),
+            output_field=models.IntegerField(),
+        )
+        return (
+            self.filter(models.Q(organisation__isnull=True) | models.Q(organisation_id=profile.organisation_id))
+            .alias(doc_rank=doc_rank)
+            .filter(doc_rank__lte=profile.clearance_rank)
         )
 
 
 class Document(models.Model):
-    id = models.UUIDField(default=uuid.uuid4, unique=True, null=False, primary_key=True)
+    id = models.UUIDField(primary_key=True, default=uuid7)
     title = models.CharField(max_length=64)
 
     # filename = models.FileField(upload_to="docs/")
@@ -221,33 +308,85 @@ class Document(models.Model):
         settings.AUTH_USER_MODEL, on_delete=models.PROTECT, related_name="+", null=True
     )
 
-    checksum_sha256 = models.CharField(max_length=64, db_index=True, blank=True)
-    search_tsv = SearchVectorField(null=True, blank=True)   # populated by DB trigger
+    # indexed via the partial doc_sha_idx in Meta
+    checksum_sha256 = models.CharField(max_length=64, blank=True)
+    # tree hash over 8MB parts (see utils.sha256_tree); lets big objects be verified in parallel
+    checksum_tree = models.CharField(max_length=64, blank=True, default="")
+    search_tsv = SearchVectorField(null=True, blank=True)   # populated by DB trigger (title, extracted_text, doc_type, confidentiality)
     extracted_text = models.TextField(blank=True, default="")
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    objects = DocumentQuerySet.as_manager()
+
+    # SHA-256 a client reported for a direct upload; never stored, only checked
+    # against the server's own digest by tasks.compute_document_checksum
+    claimed_checksum = ""
+
+    class Meta:
+        indexes = [
+            # serves the per-project "latest documents" slice used by report generation
+            models.Index(fields=["process", "-timestamp", "-created_at"], name="doc_process_ts_idx"),
+            # access predicate in DocumentQuerySet.accessible_to
+            models.Index(fields=["organisation", "confidentiality"], name="doc_org_conf_idx"),
+            # newest-first library / dashboard lists; id keeps the order stable
+            # for pagination, the organisation variant serves org-scoped users.
+            # title is carried along so the "recent" cards are index-only scans
+            models.Index(fields=["-created_at", "id"], include=["title"], name="doc_created_idx"),
+            models.Index(
+                fields=["organisation", "-created_at"], include=["id", "title"], name="doc_org_created_idx"
+            ),
+            # tags__contains / tags__overlap filters
+            GinIndex(fields=["tags"], name="doc_tags_gin"),
+            # dedup lookups; rows still waiting on a checksum are left out
+            models.Index(
+                fields=["checksum_sha256"],
+                name="doc_sha_idx",
+                condition=models.Q(checksum_sha256__gt=""),
+            ),
+        ]
+        constraints = [
+            # nulls_distinct=False so documents with no organisation are deduped
+            # among themselves too (NULLs are otherwise never equal in a UNIQUE)
+            models.UniqueConstraint(
+                fields=["organisation", "checksum_sha256"],
+                condition=models.Q(checksum_sha256__gt=""),
+                nulls_distinct=False,
+                name="doc_sha_unique_per_org",
+            ),
+        ]
+
     def save(self, *args, **kwargs):
         # Compute SHA-256 checksum if file exists and checksum not already set
+        needs_checksum = False
         if self.file and not self.checksum_sha256:
-            from .utils import sha256_file
-            self.checksum_sha256 = sha256_file(self.file)
+            from .utils import HashingFile
+            if not self.file._committed:
+                # new upload: store it ourselves through a hashing wrapper so the
+                # bytes are read once (same call FileField.pre_save would make)
+                tee = HashingFile(self.file.file)
+                self.file.save(self.file.name, tee, save=False)
+                self.checksum_sha256 = tee.hexdigest() or ""
+                self.checksum_tree = tee.tree_hexdigest() or ""
+            # anything not hashed in-pass is read back from MinIO in the background
+            needs_checksum = not self.checksum_sha256
         # Ensure extracted_text is never NULL
         if self.extracted_text is None:
             self.extracted_text = ""
         super().save(*args, **kwargs)
+        if needs_checksum:
+            from .tasks import enqueue, compute_document_checksum
+            enqueue(compute_document_checksum, self.pk, self.claimed_checksum)
 
     def delete(self, *args, **kwargs):
-        # Delete the file from storage (MinIO) before deleting the database record
-        if self.file:
-            try:
-                self.file.delete(save=False)
-            except Exception as e:
-                # Log the error but continue with deletion
-                import logging
-                logger = logging.getLogger(__name__)
-                logger.warning(f"Failed to delete file {self.file.name} from storage: {e}")
-        super().delete(*args, **kwargs)
+        # Remove the file from storage (MinIO) only once the row is gone for good,
+        # and off the request thread; failures are logged by the task runner
+        name = self.file.name if self.file else None
+        result = super().delete(*args, **kwargs)
+        if name:
+            from .tasks import enqueue, delete_storage_object
+            enqueue(delete_storage_object, name)
+        return result
 
     def __str__(self):
         return self.title
@@ -255,10 +394,10 @@ class Document(models.Model):
     def __repr__(self):
         return (
             f"Document(id={self.id},title={self.title},filepath={self.file},"
-            f"organisation={self.organisation},process={self.process},"
+            f"organisation_id={self.organisation_id},process_id={self.process_id},"
             f"doc_type={self.doc_type},confidentiality={self.confidentiality},"
-            f"checksum_sha256={self.checksum_sha256},created_by={self.created_by},"
-            f"created_at={self.created_at},"
+            f"checksum_sha256={self.checksum_sha256},created_by_id={self.created_by_id},"
+            f"created_at={self.created_at})"
         )
 
 class DocumentChunk(models.Model):
@@ -298,6 +437,22 @@ class DocumentChunk(models.Model):
 
 # USER PROFILE & PERMISSIONS ---------------------------------
 
+# clearance ranks used for document access checks; a user may see documents
+# whose confidentiality rank is <= their clearance rank
+_DOC_RANK = {
+    "public": 0,
+    "internal": 1,
+    "confidential": 2,
+    "jorc_restricted": 3,
+}
+_USER_RANK = {
+    "PUBLIC": 0,
+    "INTERNAL": 1,
+    "CONFIDENTIAL": 2,
+    "JORC_APPROVED": 3,
+}
+
+
 class UserProfile(models.Model):
     """Extended user attributes for mining/exploration governance"""
 
@@ -323,7 +478,7 @@ class UserProfile(models.Model):
         JORC_APPROVED = "JORC_APPROVED", _("JORC Approved Personnel")
 
     # Core fields
-    user = models.OneToOneField(User, on_delete=models.CASCADE, related_name='profile')
+    user = models.OneToOneField(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='profile')
     organisation = models.ForeignKey(Organisation, on_delete=models.CASCADE, null=True, blank=True)
     role = models.CharField(max_length=32, choices=RoleChoices.choices, default=RoleChoices.VIEWER)
     clearance_level = models.CharField(
@@ -369,28 +524,24 @@ class UserProfile(models.Model):
             self.RoleChoices.OPERATIONS_MANAGER,
         ]
 
+    @property
+    def clearance_rank(self) -> int:
+        return _USER_RANK.get(self.clearance_level, 0)
+
     def can_access_document(self, document):
         """Attribute-based access control for documents"""
-        # Same organisation check
-        if document.organisation and document.organisation != self.organisation:
+        # Same organisation check (compare ids so neither FK is fetched)
+        if document.organisation_id and document.organisation_id != self.organisation_id:
             return False
 
-        # Clearance level check
-        doc_clearance_hierarchy = {
-            'public': 0,
-            'internal': 1,
-            'confidential': 2,
-            'jorc_restricted': 3,
-        }
-        user_clearance_hierarchy = {
-            self.ClearanceLevel.PUBLIC: 0,
-            self.ClearanceLevel.INTERNAL: 1,
-            self.ClearanceLevel.CONFIDENTIAL: 2,
-            self.ClearanceLevel.JORC_APPROVED: 3,
-        }
-
-        doc_level = doc_clearance_hierarchy.get(document.confidentiality.lower() if document.confidentiality else 'internal', 0)
-        user_level = user_clearance_hierarchy.get(self.clearance_level, 0)
+        # Clearance level check. confidentiality is free text, so only lower()
+        # it when the exact value isn't already a known level. Blank or unknown
+        # values are treated as internal rather than public
+        conf = document.confidentiality or "internal"
+        doc_level = _DOC_RANK.get(conf)
+        if doc_level is None:
+            doc_level = _DOC_RANK.get(conf.lower(), _DOC_RANK["internal"])
+        user_level = self.clearance_rank
 
         return user_level >= doc_level
 
@@ -403,7 +554,7 @@ class SavedReport(models.Model):
         MANUAL_EDIT = "MANUAL_EDIT", _("Manual Edit")
         REGENERATED = "REGENERATED", _("Regenerated")
 
-    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    id = models.UUIDField(primary_key=True, default=uuid7, editable=False)
     process = models.ForeignKey(
         Process, on_delete=models.SET_NULL, null=True, blank=True, related_name="saved_reports"
     )
@@ -468,16 +619,42 @@ class SavedReport(models.Model):
 
 
 # Autocreate profile when user is created
-@receiver(post_save, sender=User)
+@receiver(post_save, sender=settings.AUTH_USER_MODEL)
 def create_user_profile(sender, instance, created, raw, **kwargs):
     if created and not raw:
         UserProfile.objects.create(user=instance)
 
 
-@receiver(post_save, sender=User)
-def save_user_profile(sender, instance, **kwargs):
-    if hasattr(instance, 'profile'):
-        instance.profile.save()
+# "recent documents / projects" lists shown on the landing pages are cached per
+# organisation scope ("all" is the superuser view); drop both on any change
+def recent_cache_key(model, scope) -> str:
+    return f"recent:v1:{model._meta.model_name}:{scope}"
+
+
+@receiver(post_save, sender=Document, dispatch_uid="core_recent_docs_save")
+@receiver(post_delete, sender=Document, dispatch_uid="core_recent_docs_delete")
+@receiver(post_save, sender=Process, dispatch_uid="core_recent_procs_save")
+@receiver(post_delete, sender=Process, dispatch_uid="core_recent_procs_delete")
+def invalidate_recent_lists(sender, instance, **kwargs):
+    django_cache.delete_many([
+        recent_cache_key(sender, instance.organisation_id),
+        recent_cache_key(sender, "all"),
+    ])
+
+
+# page 1 of the unfiltered documents list, cached per organisation ("all" for
+# superusers). Views drop their own scope after an upload; a delete from
+# anywhere (including background tasks) drops both scopes the row appeared in
+def docs_page_cache_key(scope) -> str:
+    return f"docs:unfiltered:page1:v2:{scope}"
+
+
+@receiver(post_delete, sender=Document, dispatch_uid="core_docs_page_delete")
+def invalidate_docs_page(sender, instance, **kwargs):
+    django_cache.delete_many([
+        docs_page_cache_key(instance.organisation_id),
+        docs_page_cache_key("all"),
+    ])
 
 
 # AUDIT TRAIL ---------------------------------
@@ -495,7 +672,7 @@ class AuditLog(models.Model):
         DOWNLOAD = "DOWNLOAD", _("Downloaded")
 
     # Who made the changes
-    user = models.ForeignKey(User, on_delete=models.SET_NULL, null=True)
+    user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.SET_NULL, null=True)
 
     # What was changed
     action = models.CharField(max_length=16, choices=ActionType.choices)
@@ -515,9 +692,11 @@ class AuditLog(models.Model):
         db_table = 'audit_logs'
         ordering = ['-timestamp']
         indexes = [
-            models.Index(fields=['content_type', 'object_id'], name='audit_logs_content_b0ef47_idx'),
-            models.Index(fields=['user', 'action'], name='audit_logs_user_id_d685f3_idx'),
-            models.Index(fields=['timestamp'], name='audit_logs_timesta_423be6_idx'),
+            # object timeline / per-user activity, already in display order
+            models.Index(fields=['content_type', 'object_id', '-timestamp'], name='audit_obj_ts'),
+            models.Index(fields=['user', '-timestamp'], name='audit_user_ts'),
+            # append-only, so BRIN covers time-range scans at a fraction of the size
+            BrinIndex(fields=['timestamp'], name='audit_ts_brin', pages_per_range=32),
         ]
 
     def __str__(self):
@@ -526,6 +705,16 @@ class AuditLog(models.Model):
 
 
 # APPROVAL WORKFLOWS ---------------------------------
+
+# roles allowed to approve GENERAL workflows
+_GENERAL_APPROVER_ROLES = frozenset({
+    UserProfile.RoleChoices.FIELD_LEAD,
+    UserProfile.RoleChoices.DATA_MANAGER,
+    UserProfile.RoleChoices.OPERATIONS_MANAGER,
+    UserProfile.RoleChoices.ADMIN,
+})
+
+
 class ApprovalWorkflow(models.Model):
     """JORC/VALMIN approval workflows"""
 
@@ -550,8 +739,8 @@ class ApprovalWorkflow(models.Model):
     status = models.CharField(max_length=16, choices=Status.choices, default=Status.PENDING)
 
     # Which users are associated 
-    submitted_by = models.ForeignKey(User, on_delete=models.CASCADE, related_name='workflow_submissions')
-    approved_by = models.ForeignKey(User, on_delete=models.SET_NULL, null=True, blank=True, related_name='workflow_approvals')
+    submitted_by = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='workflow_submissions')
+    approved_by = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.SET_NULL, null=True, blank=True, related_name='workflow_approvals')
 
     # Context
     submission_notes = models.TextField(blank=True)
@@ -572,30 +761,24 @@ class ApprovalWorkflow(models.Model):
 
     def can_approve(self, user):
         """Check if user can approve this workflow"""
-        if not hasattr(user, 'profile'):
+        profile = getattr(user, 'profile', None)
+        if profile is None:
             return False
 
-        profile = user.profile
-
         if self.workflow_type == self.WorkflowType.JORC:
             return profile.can_approve_jorc
         elif self.workflow_type == self.WorkflowType.VALMIN:
             return profile.can_approve_valmin
         else:
             # General approval - check role
-            return profile.role in [
-                UserProfile.RoleChoices.FIELD_LEAD,
-                UserProfile.RoleChoices.DATA_MANAGER,
-                UserProfile.RoleChoices.OPERATIONS_MANAGER,
-                UserProfile.RoleChoices.ADMIN,
-            ]
+            return profile.role in _GENERAL_APPROVER_ROLES
 
 
 # DOCUMENT VIEW TRACKING (Phase 2) ---------------------------------
 
 class DocumentView(models.Model):
     """Track when users view documents for audit trail"""
-    user = models.ForeignKey(User, on_delete=models.CASCADE)
+    user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE)
     document = models.ForeignKey('Document', on_delete=models.CASCADE)
     viewed_at = models.DateTimeField(auto_now_add=True)
     ip_address = models.GenericIPAddressField(null=True, blank=True)
@@ -605,7 +788,8 @@ class DocumentView(models.Model):
         ordering = ['-viewed_at']
         indexes = [
             models.Index(fields=['document', 'user'], name='document_vi_documen_dcb332_idx'),
-            models.Index(fields=['viewed_at'], name='document_vi_viewed__659188_idx'),
+            models.Index(fields=['document', '-viewed_at'], name='docview_doc_ts'),
+            BrinIndex(fields=['viewed_at'], name='docview_ts_brin', pages_per_range=32),
         ]
 
     def __str__(self):
@@ -650,12 +834,25 @@ class DocLink(models.Model):
 
 # HELPER FUNCTIONS ---------------------------------
 
+# ContentType per model class for audit entries. Filled on first use rather than
+# at start-up (no DB access during app loading); CoreConfig clears it after
+# migrate/flush, when content type ids can change
+_CT_BY_MODEL = {}
+
+
+def _content_type_for(model):
+    ct = _CT_BY_MODEL.get(model)
+    if ct is None:
+        ct = _CT_BY_MODEL[model] = ContentType.objects.get_for_model(model)
+    return ct
+
+
 def log_audit(user, action, obj, description="", ip_address=None, user_agent=""):
     """Create audit trail entry"""
     AuditLog.objects.create(
         user=user,
         action=action,
-        content_type=ContentType.objects.get_for_model(obj),
+        content_type=_content_type_for(type(obj)),
         object_id=obj.id,
         description=description,
         ip_address=ip_address,
@@ -663,24 +860,57 @@ def log_audit(user, action, obj, description="", ip_address=None, user_agent="")
     )
 
 
-# class ProjectOp(models.Model):
-#     MODE = (("EXP","Exploration"), ("MIN","Mining"))
-#     id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
-#     mode = models.CharField(max_length=3, choices=MODE)
-#     name = models.CharField(max_length=255)
-# geom = models.MultiPolygonField(srid=4326, null=True, blank=True)
-# commodity = models.CharField(max_length=64, blank=True)
-#     def __str__(self): return self.name
-#
-# class Document(models.Model):
-#     id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
-#     file = models.FileField(upload_to="docs/")
-#     title = models.CharField(max_length=255)
-#     year = models.IntegerField(null=True, blank=True)
-#     doc_type = models.CharField(max_length=64, blank=True)
-#     confidentiality = models.CharField(max_length=32, default="internal")
-#     checksum_sha256 = models.CharField(max_length=64, db_index=True, blank=True)
-#     project = models.ForeignKey(ProjectOp, null=True, blank=True, on_delete=models.SET_NULL)
-#     created_by = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.PROTECT, related_name="+")
-#     created_at = models.DateTimeField(auto_now_add=True)
-#     def __str__(self): return self.title
+# above this many entries log_audit_bulk streams rows with COPY instead of INSERT batches
+AUDIT_COPY_THRESHOLD = 10_000
+
+
+def log_audit_bulk(user, action, objs, description="", ip_address=None, user_agent="", batch_size=1000):
+    """
+    Create one audit entry per object in `objs` (e.g. a bulk import).
+    ContentType is resolved once per model; returns the number of entries.
+    """
+    rows = [(_content_type_for(type(obj)), obj.pk) for obj in objs]
+
+    if len(rows) > AUDIT_COPY_THRESHOLD and connection.vendor == "postgresql":
+        _copy_audit_rows(user, action, rows, description, ip_address, user_agent)
+    else:
+        AuditLog.objects.bulk_create(
+            [
+                AuditLog(
+                    user=user,
+                    action=action,
+                    content_type=ct,
+                    object_id=pk,
+                    description=description,
+                    ip_address=ip_address,
+                    user_agent=user_agent,
+                )
+                for ct, pk in rows
+            ],
+            batch_size=batch_size,
+        )
+    return len(rows)
+
+
+def _copy_audit_rows(user, action, rows, description, ip_address, user_agent):
+    import csv
+    import io
+    from django.utils import timezone
+
+    # QUOTE_NONNUMERIC writes None as "", which FORCE_NULL turns back into NULL
+    # for the nullable columns; text columns keep "" as an empty string
+    now = timezone.now().isoformat()
+    user_id = user.pk if user is not None else None
+    buf = io.StringIO()
+    writer = csv.writer(buf, quoting=csv.QUOTE_NONNUMERIC)
+    for ct, pk in rows:
+        writer.writerow([user_id, action, ct.pk, str(pk), description, ip_address, user_agent, now])
+    buf.seek(0)
+
+    table = AuditLog._meta.db_table
+    with connection.cursor() as cursor:
+        cursor.copy_expert(
+            f"COPY {table} (user_id, action, content_type_id, object_id, description, ip_address, user_agent, timestamp) "
+            "FROM STDIN WITH (FORMAT csv, FORCE_NULL (user_id, ip_address))",
+            buf,
+        )
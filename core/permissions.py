@@ -6,7 +6,7 @@ from functools import wraps
 from django.core.exceptions import PermissionDenied
 from django.http import HttpResponseForbidden
 
-from .models import UserProfile, log_audit, AuditLog
+from .models import UserProfile, _USER_RANK
 
 
 def role_required(*allowed_roles):
@@ -63,12 +63,9 @@ def clearance_required(min_level):
         #@clearance_required(UserProfile.ClearanceLevel.JORC_APPROVED)
         #def view_jorc_report(request, report_id):
 
-    clearance_hierarchy = {
-        UserProfile.ClearanceLevel.PUBLIC: 0,
-        UserProfile.ClearanceLevel.INTERNAL: 1,
-        UserProfile.ClearanceLevel.CONFIDENTIAL: 2,
-        UserProfile.ClearanceLevel.JORC_APPROVED: 3,
-    }
+    # resolved once when the view is decorated, not on every request;
+    # the ranking is the same one UserProfile.clearance_rank uses
+    required_level = _USER_RANK.get(min_level, 0)
 
     def decorator(view_func):
         @wraps(view_func)
@@ -76,13 +73,11 @@ def clearance_required(min_level):
             if not request.user.is_authenticated:
                 raise PermissionDenied("Authentication required")
 
-            if not hasattr(request.user, 'profile'):
+            profile = getattr(request.user, 'profile', None)
+            if profile is None:
                 raise PermissionDenied("User profile not found")
 
-            user_level = clearance_hierarchy.get(request.user.profile.clearance_level, 0)
-            required_level = clearance_hierarchy.get(min_level, 0)
-
-            if user_level < required_level:
+            if profile.clearance_rank < required_level:
                 raise PermissionDenied(f"Insufficient clearance level")
 
             return view_func(request, *args, **kwargs)
@@ -106,37 +101,19 @@ def log_view_access(model_class):
             # Try to get object ID from kwargs
             obj_id = kwargs.get('pk') or kwargs.get('id') or kwargs.get('doc_id')
 
+            # a missing object raises Http404 out of the view, so reaching this
+            # point means it exists; no need to load it again. The audit rows
+            # are queued and written in batches by core.tasks' audit writer
             if obj_id and request.user.is_authenticated:
-                try:
-                    obj = model_class.objects.get(pk=obj_id)
-
-                    # Get IP address
-                    ip_address = request.META.get('HTTP_X_FORWARDED_FOR')
-                    if ip_address:
-                        ip_address = ip_address.split(',')[0]
-                    else:
-                        ip_address = request.META.get('REMOTE_ADDR')
-
-                    # Log the view
-                    log_audit(
-                        user=request.user,
-                        action=AuditLog.ActionType.VIEW,
-                        obj=obj,
-                        description=f"User viewed {model_class.__name__}",
-                        ip_address=ip_address,
-                        user_agent=request.META.get('HTTP_USER_AGENT', '')[:500]
-                    )
-
-                    # Also create DocumentView record if it's a Document
-                    if model_class.__name__ == 'Document':
-                        from .models import DocumentView
-                        DocumentView.objects.create(
-                            user=request.user,
-                            document=obj,
-                            ip_address=ip_address
-                        )
-                except model_class.DoesNotExist:
-                    pass  # Object not found, view will handle 404
+                from .tasks import record_view
+
+                record_view(
+                    model_class,
+                    obj_id,
+                    request.user.pk,
+                    get_user_ip(request),
+                    request.META.get('HTTP_USER_AGENT', '')[:500],
+                )
 
             return response
         return wrapper
@@ -173,10 +150,9 @@ def can_approve_workflow(user, workflow_type):
 
 
 def get_user_ip(request):
-    #Extract user IP address from request
-    ip_address = request.META.get('HTTP_X_FORWARDED_FOR')
-    if ip_address:
-        ip_address = ip_address.split(',')[0]
-    else:
-        ip_address = request.META.get('REMOTE_ADDR')
+    #Extract user IP address from request (set once by ClientIpMiddleware)
+    ip_address = getattr(request, 'client_ip', None)
+    if ip_address is None:
+        from .middleware import _parse_client_ip
+        ip_address = _parse_client_ip(request)
     return ip_address
@@ -0,0 +1,19 @@
+from boto3.s3.transfer import TransferConfig
+from botocore.config import Config
+from storages.backends.s3boto3 import S3Boto3Storage
+
+
+class MinioStorage(S3Boto3Storage):
+    """
+    S3Boto3Storage that takes client_config and transfer_config as plain dicts
+    of botocore Config / boto3 TransferConfig arguments. settings.py can then
+    describe the MinIO tuning without importing boto3, which is only loaded
+    once something actually touches the default storage.
+    """
+
+    def __init__(self, **settings):
+        if isinstance(settings.get("client_config"), dict):
+            settings["client_config"] = Config(**settings["client_config"])
+        if isinstance(settings.get("transfer_config"), dict):
+            settings["transfer_config"] = TransferConfig(**settings["transfer_config"])
+        super().__init__(**settings)
@@ -0,0 +1,242 @@
+"""
+Background jobs kept off the request thread.
+
+There is no task queue in this deployment, so jobs run on a small in-process
+thread pool and are only submitted once the surrounding transaction commits.
+Report warm-ups get a pool of their own (see enqueue_report_warm) and view
+audit rows a batching writer thread (see record_view). The task pool and the
+audit writer are drained at interpreter exit so queued work isn't dropped on a
+restart; warm-ups that haven't started are.
+"""
+import atexit
+import logging
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from django.core.cache import cache
+from django.db import IntegrityError, connections, transaction
+
+log = logging.getLogger(__name__)
+
+_executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix="core-tasks")
+# finish jobs already submitted (checksums, storage deletes) before exiting
+atexit.register(_executor.shutdown, wait=True)
+
+# report warm-ups are long LLM calls, so they get a pool of their own and can't
+# hold checksums and storage deletes up behind them. They are only a cache
+# optimisation: at exit, ones that haven't started are dropped
+_report_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="core-reports")
+atexit.register(_report_executor.shutdown, wait=False, cancel_futures=True)
+
+# how long a queued warm-up blocks further ones for the same report; a job
+# dropped at shutdown stops blocking once this runs out
+REPORT_WARM_PENDING_TTL = 15 * 60
+
+
+def _run(fn, *args):
+    try:
+        fn(*args)
+    except Exception:
+        log.exception("Background task %s%r failed", fn.__name__, args)
+    finally:
+        # worker threads get their own DB connections; don't leak them
+        connections.close_all()
+
+
+def enqueue(fn, *args):
+    """Run fn(*args) on the background pool after the current transaction commits."""
+    transaction.on_commit(lambda: _executor.submit(_run, fn, *args))
+
+
+def enqueue_report_warm(process_id, clearance_level):
+    """
+    Pre-warm the project report for process_id at clearance_level after the
+    current transaction commits. A warm-up already queued for the same report
+    absorbs this one, so a bulk upload to one project queues one LLM call.
+    """
+    pending_key = f"report:warm:{process_id}:{clearance_level}"
+
+    def submit():
+        if cache.add(pending_key, 1, REPORT_WARM_PENDING_TTL):
+            _report_executor.submit(_run, warm_project_report, process_id, clearance_level, pending_key)
+
+    transaction.on_commit(submit)
+
+
+def warm_project_report(process_id, clearance_level, pending_key):
+    from .ai.report_service import generate_project_report
+
+    # released before generating, not after: an upload landing while this runs
+    # changes the report fingerprint and needs a warm-up of its own
+    cache.delete(pending_key)
+    generate_project_report(process_id, clearance_level=clearance_level)
+
+
+def compute_document_checksum(doc_id, claimed=""):
+    """
+    Fill in checksum_sha256 for a document whose file is already in storage.
+
+    `claimed` is the digest a client reported for a direct upload. The server's
+    own digest is the one kept; a document whose bytes don't match the claim, or
+    that duplicates another document in its organisation, is removed and the
+    removal recorded for the uploader (see reject_upload).
+    """
+    from .models import Document
+    from .utils import object_checksums, violated_constraint
+
+    doc = (
+        Document.objects.filter(pk=doc_id)
+        .only("id", "title", "file", "organisation_id", "created_by_id", "checksum_sha256")
+        .first()
+    )
+    if doc is None or not doc.file or doc.checksum_sha256:
+        return
+    digest, tree = object_checksums(doc.file.name)
+    if claimed and claimed != digest:
+        log.warning("Document %s: stored object hashes to %s, client claimed %s; removing it", doc_id, digest, claimed)
+        reject_upload(doc, "the stored file does not match the checksum sent by the browser")
+        return
+    try:
+        with transaction.atomic():
+            # conditional update so a checksum set meanwhile isn't overwritten
+            Document.objects.filter(pk=doc_id, checksum_sha256="").update(
+                checksum_sha256=digest, checksum_tree=tree
+            )
+    except IntegrityError as exc:
+        if violated_constraint(exc) != "doc_sha_unique_per_org":
+            raise
+        log.info("Document %s duplicates an existing document (checksum %s); removing it", doc_id, digest)
+        reject_upload(doc, "duplicate file detected (checksum match)")
+
+
+def reject_upload(doc, reason):
+    """
+    Remove a document that failed verification after its upload was accepted,
+    leaving a REJECT audit entry for the uploader; the upload page lists these
+    so the upload doesn't just disappear. Deleting the row also removes its
+    chunks, the stored object and the cached documents page.
+    """
+    from .models import AuditLog, _content_type_for
+
+    with transaction.atomic():
+        AuditLog.objects.create(
+            user_id=doc.created_by_id,
+            action=AuditLog.ActionType.REJECT,
+            content_type=_content_type_for(type(doc)),
+            object_id=doc.pk,
+            description=f'Upload "{doc.title}" was removed: {reason}.',
+        )
+        doc.delete()
+
+
+def delete_storage_object(name):
+    """Remove a file from the default storage (MinIO)."""
+    from django.core.files.storage import default_storage
+
+    try:
+        default_storage.delete(name)
+    except Exception as e:
+        # the row is already gone; an orphaned object is only worth a warning
+        log.warning("Failed to delete file %s from storage: %s", name, e)
+
+
+# View audit rows are buffered in memory and written in batches by a single
+# writer thread, so a document GET does no audit INSERTs of its own. At
+# interpreter exit (including gunicorn worker recycling) the writer is told
+# to stop and joined, so rows already queued are still written.
+AUDIT_BATCH_SIZE = 500
+AUDIT_BATCH_WAIT = 0.5  # seconds the writer waits for more rows before writing
+AUDIT_EXIT_TIMEOUT = 30  # seconds to wait for the final flush at shutdown
+
+_audit_queue = queue.SimpleQueue()
+_audit_stop = object()
+_audit_writer = None
+_audit_writer_lock = threading.Lock()
+
+
+def record_view(model_class, obj_id, user_id, ip_address, user_agent):
+    """
+    Queue an audit entry for a view of obj_id (and, for documents, a DocumentView
+    row) once the current transaction commits.
+    """
+    entry = (model_class, obj_id, user_id, ip_address, user_agent)
+    transaction.on_commit(lambda: _queue_view(entry))
+
+
+def _queue_view(entry):
+    _audit_queue.put(entry)
+    _start_audit_writer()
+
+
+def _start_audit_writer():
+    global _audit_writer
+    if _audit_writer is not None and _audit_writer.is_alive():
+        return
+    with _audit_writer_lock:
+        if _audit_writer is None or not _audit_writer.is_alive():
+            _audit_writer = threading.Thread(target=_audit_loop, name="core-audit", daemon=True)
+            _audit_writer.start()
+
+
+def _audit_loop():
+    stopping = False
+    while not stopping:
+        batch = []
+        item = _audit_queue.get()
+        while True:
+            if item is _audit_stop:
+                stopping = True
+            else:
+                batch.append(item)
+            if stopping or len(batch) >= AUDIT_BATCH_SIZE:
+                break
+            try:
+                item = _audit_queue.get(timeout=AUDIT_BATCH_WAIT)
+            except queue.Empty:
+                break
+        if batch:
+            _run(write_view_batch, batch)
+
+
+@atexit.register
+def _flush_audit_queue():
+    if _audit_writer is not None and _audit_writer.is_alive():
+        _audit_queue.put(_audit_stop)
+        _audit_writer.join(AUDIT_EXIT_TIMEOUT)
+
+
+def write_view_batch(batch):
+    """Write queued record_view entries with one bulk INSERT per table."""
+    from .models import AuditLog, Document, DocumentView, _content_type_for
+
+    audits, views = [], []
+    for model_class, obj_id, user_id, ip_address, user_agent in batch:
+        audits.append(
+            AuditLog(
+                user_id=user_id,
+                action=AuditLog.ActionType.VIEW,
+                content_type=_content_type_for(model_class),
+                object_id=obj_id,
+                description=f"User viewed {model_class.__name__}",
+                ip_address=ip_address,
+                user_agent=user_agent,
+            )
+        )
+        if model_class is Document:
+            views.append(DocumentView(user_id=user_id, document_id=obj_id, ip_address=ip_address))
+
+    try:
+        with transaction.atomic():
+            AuditLog.objects.bulk_create(audits, batch_size=AUDIT_BATCH_SIZE)
+            DocumentView.objects.bulk_create(views, batch_size=AUDIT_BATCH_SIZE)
+    except IntegrityError:
+        # e.g. a document deleted while its view was queued: one bad row
+        # mustn't lose the rest of the batch
+        log.warning("Batched view audit failed; writing %d rows one at a time", len(audits) + len(views))
+        for row in audits + views:
+            try:
+                with transaction.atomic():
+                    row.save(force_insert=True)
+            except IntegrityError:
+                log.warning("Dropped view audit row %r", row)
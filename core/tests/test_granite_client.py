@@ -0,0 +1,100 @@
+"""
+Tests for core/ai/granite_client.py. The client's HTTP session is replaced by a
+mock, so no model host is needed.
+
+Run with:
+docker compose exec web python manage.py test core.tests.test_granite_client --verbosity=2
+
+"""
+import json
+import os
+from unittest import mock
+
+import requests
+from django.test import SimpleTestCase
+
+from core.ai.granite_client import RETRY_TOTAL, GraniteClient
+
+
+def ollama_client(lines):
+    """An Ollama client whose streamed response yields ``lines`` (a list or a generator function)."""
+    client = GraniteClient("ollama")
+    client.session = mock.MagicMock()
+    response = client.session.post.return_value.__enter__.return_value
+    response.iter_lines.side_effect = lambda **kwargs: iter(lines) if isinstance(lines, list) else lines()
+    return client
+
+
+class CompleteStreamTests(SimpleTestCase):
+    def test_ollama_yields_ndjson_fragments(self):
+        client = ollama_client([
+            json.dumps({"response": "## Summary"}),
+            "",  # keep-alive blank lines are skipped
+            json.dumps({"response": "\nGold"}),
+            json.dumps({"response": "", "done": True}),
+        ])
+        self.assertEqual(list(client.complete_stream("prompt")), ["## Summary", "\nGold", ""])
+        payload = client.session.post.call_args.kwargs["json"]
+        self.assertTrue(payload["stream"])
+        self.assertTrue(client.session.post.call_args.kwargs["stream"])
+
+    def test_ollama_stops_at_done(self):
+        client = ollama_client([
+            json.dumps({"response": "last", "done": True}),
+            json.dumps({"response": "after done"}),
+        ])
+        self.assertEqual(list(client.complete_stream("prompt")), ["last"])
+
+    def test_ollama_error_chunk_raises(self):
+        client = ollama_client([
+            json.dumps({"response": "partial"}),
+            json.dumps({"error": "model not found"}),
+        ])
+        stream = client.complete_stream("prompt")
+        self.assertEqual(next(stream), "partial")
+        with self.assertRaisesMessage(RuntimeError, "model not found"):
+            next(stream)
+
+    def test_hf_yields_whole_generation(self):
+        with mock.patch.dict(os.environ, {"HF_INFERENCE_URL": "https://hf.example/models/granite", "HF_TOKEN": "t0k"}):
+            client = GraniteClient("hf")
+        client.session = mock.MagicMock()
+        client.session.post.return_value.json.return_value = [{"generated_text": "Full report"}]
+
+        self.assertEqual(list(client.complete_stream("prompt", max_new_tokens=50)), ["Full report"])
+        kwargs = client.session.post.call_args.kwargs
+        self.assertEqual(kwargs["headers"], {"Authorization": "Bearer t0k"})
+        self.assertEqual(kwargs["json"]["parameters"], {"max_new_tokens": 50})
+
+    def test_hf_unexpected_body_is_stringified(self):
+        with mock.patch.dict(os.environ, {"HF_INFERENCE_URL": "https://hf.example/models/granite"}):
+            client = GraniteClient("hf")
+        client.session = mock.MagicMock()
+        client.session.post.return_value.json.return_value = {"error": "loading"}
+        self.assertEqual(list(client.complete_stream("prompt")), [str({"error": "loading"})])
+
+
+class CompleteRetryTests(SimpleTestCase):
+    def test_complete_joins_fragments(self):
+        client = ollama_client([
+            json.dumps({"response": "Gold "}),
+            json.dumps({"response": "project", "done": True}),
+        ])
+        self.assertEqual(client.complete("prompt"), "Gold project")
+        client.session.post.assert_called_once()
+
+    def test_mid_stream_failure_is_not_reissued(self):
+        """Retries belong to the adapter; complete() must not multiply them with a loop of its own."""
+        def lines():
+            yield json.dumps({"response": "Gold "})
+            raise requests.ConnectionError("Read timed out.")
+
+        client = ollama_client(lines)
+        with self.assertRaises(requests.ConnectionError):
+            client.complete("prompt")
+        client.session.post.assert_called_once()
+
+    def test_adapter_retries_post(self):
+        retry = GraniteClient("ollama").session.get_adapter("http://localhost:11434").max_retries
+        self.assertEqual(retry.total, RETRY_TOTAL)
+        self.assertIn("POST", retry.allowed_methods)
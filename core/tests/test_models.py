@@ -1,5 +1,8 @@
+from unittest import mock
+
 from django.contrib.auth.models import User
 from django.contrib.contenttypes.models import ContentType
+from django.core.cache import cache
 from django.core.exceptions import ValidationError
 from django.test import TestCase
 
@@ -11,7 +14,9 @@ from core.models import (
     Process,
     UserProfile,
     AuditLog,
-    log_audit
+    DocumentView,
+    log_audit,
+    log_audit_bulk,
 )
 
 
@@ -22,6 +27,11 @@ class ChoiceValidationTests(TestCase):
         org.save()
         self.assertEqual(Organisation.objects.count(), 1)
 
+    def test_validated_save_is_a_single_query(self):
+        # clean() checks choices in Python; the CHECK constraint isn't re-run as a SELECT
+        with self.assertNumQueries(1):
+            Organisation(name="One Query Org", mode="EXPLORATION").save()
+
     def test_invalid_mode_raises_validation_error(self):
         org = Organisation(name="Invalid Org", mode="INVALID_MODE")
         with self.assertRaises(ValidationError) as ctx:
@@ -36,6 +46,21 @@ class ChoiceValidationTests(TestCase):
         with self.assertRaises(ValidationError):
             proc.save()
 
+    def test_bulk_create_validates_choices(self):
+        with self.assertRaises(ValidationError):
+            Organisation.objects.bulk_create([
+                Organisation(name="Good Org", mode="MINING"),
+                Organisation(name="Bad Org", mode="INVALID_MODE"),
+            ])
+        self.assertEqual(Organisation.objects.count(), 0)
+
+    def test_bulk_create_inserts_valid_rows(self):
+        Organisation.objects.bulk_create([
+            Organisation(name="Org A", mode="MINING"),
+            Organisation(name="Org B", mode="EXPLORATION"),
+        ])
+        self.assertEqual(Organisation.objects.count(), 2)
+
 
 class OrganisationModelTests(TestCase):
     def setUp(self):
@@ -172,12 +197,12 @@ class DocumentAccessControlTests(TestCase):
 
         self.profile.save()
 
-    def _make_doc(self, confidentiality="internal", org=None):
+    def _make_doc(self, confidentiality="internal", org=None, content=b"content"):
         from django.core.files.uploadedfile import SimpleUploadedFile
 
         return Document.objects.create(
             title="Test Doc",
-            file=SimpleUploadedFile("test.txt", b"content"),
+            file=SimpleUploadedFile("test.txt", content),
             organisation=org or self.org,
             confidentiality=confidentiality,
         )
@@ -202,6 +227,38 @@ class DocumentAccessControlTests(TestCase):
         self.profile.clearance_level = UserProfile.ClearanceLevel.JORC_APPROVED
         self.assertTrue(self.profile.can_access_document(doc))
 
+    def test_accessible_to_matches_can_access_document(self):
+        self.profile.clearance_level = UserProfile.ClearanceLevel.INTERNAL
+        self.profile.save()
+        other_org = Organisation.objects.create(name="Other", mode="EXPLORATION")
+        docs = [
+            self._make_doc(confidentiality="public", content=b"public"),
+            self._make_doc(confidentiality="Internal", content=b"internal"),
+            self._make_doc(confidentiality="confidential", content=b"confidential"),
+            self._make_doc(confidentiality="public", org=other_org),
+        ]
+
+        visible = set(Document.objects.accessible_to(self.user).values_list("pk", flat=True))
+        expected = {d.pk for d in docs if self.profile.can_access_document(d)}
+        self.assertEqual(visible, expected)
+        self.assertEqual(len(visible), 2)
+
+    def test_blank_and_unknown_confidentiality_rank_as_internal(self):
+        docs = [
+            self._make_doc(confidentiality="", content=b"blank"),
+            self._make_doc(confidentiality="draft", content=b"unknown"),
+        ]
+        for clearance, visible_count in (
+            (UserProfile.ClearanceLevel.PUBLIC, 0),
+            (UserProfile.ClearanceLevel.INTERNAL, 2),
+        ):
+            with self.subTest(clearance=clearance):
+                self.profile.clearance_level = clearance
+                self.profile.save()
+                visible = set(Document.objects.accessible_to(self.user).values_list("pk", flat=True))
+                self.assertEqual(visible, {d.pk for d in docs if self.profile.can_access_document(d)})
+                self.assertEqual(len(visible), visible_count)
+
 
 class ApprovalWorkflowTests(TestCase):
     def setUp(self):
@@ -264,4 +321,92 @@ class AuditLogTests(TestCase):
         logs = AuditLog.objects.all()
         self.assertTrue(logs[0].timestamp >= logs[1].timestamp)
 
+    def test_log_audit_bulk_creates_entry_per_object(self):
+        user = User.objects.create_user("bulk-auditor", password="pass")
+        org = Organisation.objects.create(name="Org", mode="MINING")
+        procs = [Process.objects.create(name=f"P{i}", organisation=org) for i in range(3)]
+
+        count = log_audit_bulk(user, AuditLog.ActionType.CREATE, [org, *procs])
+
+        self.assertEqual(count, 4)
+        self.assertEqual(AuditLog.objects.filter(user=user, action="CREATE").count(), 4)
+        self.assertEqual(
+            set(AuditLog.objects.values_list("object_id", flat=True)),
+            {org.pk, *(p.pk for p in procs)},
+        )
+
+    def test_log_audit_bulk_copy_path(self):
+        org = Organisation.objects.create(name="Org", mode="MINING")
+        procs = [Process.objects.create(name=f"P{i}", organisation=org) for i in range(3)]
+
+        with mock.patch("core.models.AUDIT_COPY_THRESHOLD", 1):
+            log_audit_bulk(None, AuditLog.ActionType.VIEW, procs, description="")
+
+        logs = AuditLog.objects.filter(action="VIEW")
+        self.assertEqual(logs.count(), 3)
+        log = logs.first()
+        self.assertIsNone(log.user)
+        self.assertIsNone(log.ip_address)
+        self.assertEqual(log.description, "")
+
+
+class ViewAuditBatchTests(TestCase):
+    def test_write_view_batch_bulk_inserts_audit_and_view_rows(self):
+        from core.tasks import write_view_batch
+
+        user = User.objects.create_user("viewer", password="pass")
+        org = Organisation.objects.create(name="Org", mode="MINING")
+        doc = Document.objects.create(title="Viewed", file="docs/v.pdf", organisation=org, checksum_sha256="ab" * 32)
 
+        write_view_batch([
+            (Document, doc.pk, user.pk, "10.0.0.1", "agent"),
+            (Organisation, org.pk, user.pk, "10.0.0.2", ""),
+        ])
+
+        self.assertEqual(AuditLog.objects.filter(action="VIEW", user=user).count(), 2)
+        entry = AuditLog.objects.get(object_id=doc.pk)
+        self.assertEqual(entry.content_type, ContentType.objects.get_for_model(Document))
+        self.assertEqual(entry.ip_address, "10.0.0.1")
+        # only document views get a DocumentView row
+        self.assertEqual(list(DocumentView.objects.values_list("document_id", flat=True)), [doc.pk])
+
+    def test_record_view_waits_for_commit(self):
+        from core.tasks import record_view
+
+        user = User.objects.create_user("viewer", password="pass")
+        org = Organisation.objects.create(name="Org", mode="MINING")
+        with mock.patch("core.tasks._queue_view") as queue_view:
+            with self.captureOnCommitCallbacks(execute=True):
+                record_view(Organisation, org.pk, user.pk, None, "")
+                queue_view.assert_not_called()
+        queue_view.assert_called_once_with((Organisation, org.pk, user.pk, None, ""))
+
+
+class ReportWarmTests(TestCase):
+    def setUp(self):
+        cache.clear()
+
+    def test_pending_warm_up_absorbs_repeats(self):
+        from core.tasks import enqueue_report_warm
+
+        with mock.patch("core.tasks._report_executor") as executor:
+            with self.captureOnCommitCallbacks(execute=True):
+                for _ in range(3):
+                    enqueue_report_warm("p-1", "INTERNAL")
+                enqueue_report_warm("p-1", "PUBLIC")
+        # one per report: the repeats for p-1/INTERNAL were absorbed
+        self.assertEqual(executor.submit.call_count, 2)
+
+    def test_running_warm_up_releases_its_slot(self):
+        from core.tasks import enqueue_report_warm
+
+        with mock.patch("core.tasks._report_executor") as executor:
+            with self.captureOnCommitCallbacks(execute=True):
+                enqueue_report_warm("p-1", "INTERNAL")
+            _run, fn, *args = executor.submit.call_args.args
+            with mock.patch("core.ai.report_service.generate_project_report") as generate:
+                fn(*args)
+            generate.assert_called_once_with("p-1", clearance_level="INTERNAL")
+            with self.captureOnCommitCallbacks(execute=True):
+                enqueue_report_warm("p-1", "INTERNAL")
+        self.assertEqual(executor.submit.call_count, 2)
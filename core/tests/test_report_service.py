@@ -0,0 +1,165 @@
+"""
+Tests for the prompt/context helpers in core/ai/report_service.py, and for
+the SSE view in core/views.py that streams a report.
+
+The helpers are pure Python, so only the view tests need the database.
+
+Run with:
+docker compose exec web python manage.py test core.tests.test_report_service --verbosity=2
+
+"""
+import datetime
+import json
+from types import SimpleNamespace
+from unittest import mock
+
+from django.contrib.auth.models import User
+from django.test import Client, SimpleTestCase, TestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from core.ai.report_service import _report_cache_key, build_prompt, build_structured_context
+from core.models import Organisation, Process
+
+
+def make_bundle(docs=None, **process_kwargs):
+    process = SimpleNamespace(
+        id="p-1",
+        name="Alpha Project",
+        mode="PROJECT",
+        commodity="Gold",
+        organisation=SimpleNamespace(name="GoldCorp"),
+        updated_at=timezone.make_aware(datetime.datetime(2024, 1, 1)),
+    )
+    for key, value in process_kwargs.items():
+        setattr(process, key, value)
+    return {"process": process, "docs": docs or []}
+
+
+def make_doc_row(**kwargs):
+    row = dict(
+        id="d-1",
+        title="Drill Summary",
+        timestamp=datetime.date(2024, 6, 10),
+        doc_type="Drill Log",
+        confidentiality="internal",
+        file="docs/drill.pdf",
+        created_at=timezone.make_aware(datetime.datetime(2024, 6, 11, 9, 30)),
+        checksum_sha256="abc123",
+        extracted_text="Hole DH-001\nintersected skarn",
+        created_by__username="geo1",
+    )
+    row.update(kwargs)
+    return row
+
+
+class BuildStructuredContextTests(SimpleTestCase):
+    def test_process_header(self):
+        ctx = build_structured_context(make_bundle())
+        self.assertIn("PROCESS", ctx)
+        self.assertIn("  name: Alpha Project", ctx)
+        self.assertIn("  organisation: GoldCorp", ctx)
+
+    def test_missing_organisation(self):
+        ctx = build_structured_context(make_bundle(organisation=None))
+        self.assertIn("  organisation: \n", ctx)
+
+    def test_document_row_fields(self):
+        ctx = build_structured_context(make_bundle([make_doc_row()]))
+        self.assertIn("title: 'Drill Summary'", ctx)
+        self.assertIn("uploaded_by: geo1", ctx)
+        self.assertIn("created_at: 2024-06-11 09:30", ctx)
+        self.assertIn("file: docs/drill.pdf", ctx)
+        # newlines in the snippet are flattened so each document stays on one line
+        self.assertIn("text_snippet: 'Hole DH-001 intersected skarn'", ctx)
+
+    def test_null_fields_render_empty(self):
+        row = make_doc_row(timestamp=None, created_at=None, created_by__username=None, extracted_text=None)
+        ctx = build_structured_context(make_bundle([row]))
+        self.assertIn("date: , ", ctx)
+        self.assertIn("uploaded_by: , ", ctx)
+        self.assertIn("created_at: , ", ctx)
+        self.assertIn("text_snippet: ''", ctx)
+
+
+class BuildPromptTests(SimpleTestCase):
+    def test_includes_context_and_date(self):
+        prompt = build_prompt("CTX-BLOCK", as_of="2025-01-02")
+        self.assertIn("DATE: 2025-01-02", prompt)
+        self.assertIn("CONTEXT:\nCTX-BLOCK\n", prompt)
+        self.assertIn("- 1. Project Summary", prompt)
+
+    def test_custom_sections(self):
+        prompt = build_prompt("CTX", as_of="2025-01-02", sections=["A", "B"])
+        self.assertIn("- A\n- B", prompt)
+        self.assertNotIn("Project Summary", prompt)
+
+
+def make_stats(n=1, last=None):
+    process = make_bundle()["process"]
+    if last is None and n:
+        last = timezone.make_aware(datetime.datetime(2024, 6, 11, 9, 30))
+    return {"process": process, "n": n, "last": last}
+
+
+class ReportCacheKeyTests(SimpleTestCase):
+    def test_key_scoped_by_clearance(self):
+        stats = make_stats()
+        self.assertNotEqual(
+            _report_cache_key("p-1", "INTERNAL", stats),
+            _report_cache_key("p-1", "CONFIDENTIAL", stats),
+        )
+
+    def test_key_changes_when_document_updated(self):
+        before = _report_cache_key("p-1", "INTERNAL", make_stats())
+        after = _report_cache_key(
+            "p-1", "INTERNAL", make_stats(last=timezone.make_aware(datetime.datetime(2024, 7, 1)))
+        )
+        self.assertNotEqual(before, after)
+
+    def test_key_changes_when_document_count_changes(self):
+        one = _report_cache_key("p-1", "INTERNAL", make_stats(n=1))
+        two = _report_cache_key("p-1", "INTERNAL", make_stats(n=2))
+        self.assertNotEqual(one, two)
+
+    def test_key_without_documents_uses_process_timestamp(self):
+        key = _report_cache_key("p-1", "INTERNAL", make_stats(n=0, last=None))
+        self.assertIn("2024-01-01", key)
+
+
+class ProjectReportStreamViewTests(TestCase):
+    def setUp(self):
+        self.org = Organisation.objects.create(name="Stream Org", mode="EXPLORATION")
+        self.process = Process.objects.create(name="Gold Search", organisation=self.org, mode="PROJECT")
+        self.user = User.objects.create_user("streamer", password="password123")
+        self.user.profile.organisation = self.org
+        self.user.profile.save()
+        self.client = Client()
+        self.client.force_login(self.user)
+        self.url = reverse("project_report_stream", args=[self.process.pk])
+
+    def test_fragments_are_sent_as_sse_events_then_done(self):
+        fragments = ["## Summary", '\nGold "A" grade']
+        with mock.patch("core.views.stream_project_report", return_value=iter(fragments)) as stream:
+            response = self.client.get(self.url)
+            body = b"".join(response.streaming_content).decode()
+
+        self.assertEqual(response["Content-Type"], "text/event-stream")
+        self.assertEqual(response["Cache-Control"], "no-cache")
+        self.assertEqual(response["X-Accel-Buffering"], "no")
+        stream.assert_called_once_with(str(self.process.pk), clearance_level=self.user.profile.clearance_level)
+
+        *data_events, done, trailing = body.split("\n\n")
+        # each fragment is one JSON-encoded event, so newlines in it can't end the event early
+        self.assertEqual([json.loads(e.removeprefix("data: ")) for e in data_events], fragments)
+        self.assertEqual(done, "event: done\ndata: {}")
+        self.assertEqual(trailing, "")
+
+    def test_other_organisations_project_is_not_found(self):
+        other = Process.objects.create(
+            name="Elsewhere", organisation=Organisation.objects.create(name="Other", mode="MINING"), mode="PROJECT"
+        )
+        with mock.patch("core.views.stream_project_report") as stream:
+            response = self.client.get(reverse("project_report_stream", args=[other.pk]))
+        self.assertEqual(response.status_code, 404)
+        stream.assert_not_called()
@@ -1,7 +1,8 @@
 """
 Tests for document search and filtering functionality.
 
-Covers core/views.py::documents() and the DocumentSearchForm.
+Covers core/views.py::documents(), the DocumentSearchForm and the
+prev/next-only pagination (_paginate / CountlessPage) the list views share.
 
 Run with:
 docker compose exec web python manage.py test core.tests.test_search --verbosity=2
@@ -10,10 +11,11 @@ docker compose exec web python manage.py test core.tests.test_search --verbosity
 import datetime
 from django.contrib.auth.models import User
 from django.core.cache import cache
-from django.test import TestCase, Client
+from django.test import RequestFactory, SimpleTestCase, TestCase, Client
 from django.urls import reverse
 
 from core.models import Document, Organisation, Process
+from core.views import _paginate
 
 
 # Shared fixture helpers
@@ -110,6 +112,12 @@ class KeywordSearchTests(TestCase):
         self.assertIn("Quarterly Summary", results)
         self.assertNotIn("Uranium Feasibility Study", results)
 
+    def test_search_by_confidentiality(self):
+        make_doc("Board Minutes", confidentiality="confidential", organisation=self.org)
+        results = self._get("confidential")
+        self.assertIn("Board Minutes", results)
+        self.assertNotIn("Uranium Feasibility Study", results)
+
     def test_search_by_extracted_text(self):
         results = self._get("magnetite skarn")
         self.assertIn("Field Notes", results)
@@ -405,3 +413,72 @@ class FullTextSearchTests(TestCase):
     def test_no_results_for_unknown_term(self):
         results = self._get("xyzzy_no_such_term_999")
         self.assertEqual(results, [])
+
+
+class SliceRecorder(list):
+    """A list that records the slices taken from it, standing in for a queryset."""
+
+    def __init__(self, *args):
+        super().__init__(*args)
+        self.slices = []
+
+    def __getitem__(self, key):
+        if isinstance(key, slice):
+            self.slices.append((key.start, key.stop))
+        return super().__getitem__(key)
+
+
+class PaginationTests(SimpleTestCase):
+    def setUp(self):
+        self.rows = SliceRecorder(range(45))
+
+    def _page(self, page=None, per_page=20):
+        params = {} if page is None else {"page": page}
+        return _paginate(self.rows, RequestFactory().get("/documents/", params), per_page=per_page)
+
+    def test_first_page(self):
+        page = self._page()
+        self.assertEqual(list(page), list(range(20)))
+        self.assertEqual(page.number, 1)
+        self.assertTrue(page.has_next())
+        self.assertFalse(page.has_previous())
+        self.assertEqual(page.next_page_number(), 2)
+
+    def test_has_next_comes_from_one_extra_row(self):
+        page = self._page(2)
+        # one slice, per_page + 1 rows: no separate count query
+        self.assertEqual(self.rows.slices, [(20, 41)])
+        self.assertEqual(len(page), 20)
+        self.assertTrue(page.has_next())
+
+    def test_last_page(self):
+        page = self._page(3)
+        self.assertEqual(list(page), list(range(40, 45)))
+        self.assertFalse(page.has_next())
+        self.assertTrue(page.has_previous())
+        self.assertEqual(page.previous_page_number(), 2)
+
+    def test_exactly_full_last_page_has_no_next(self):
+        self.rows = SliceRecorder(range(40))
+        page = self._page(2)
+        self.assertEqual(len(page), 20)
+        self.assertFalse(page.has_next())
+
+    def test_empty_result(self):
+        self.rows = SliceRecorder()
+        page = self._page()
+        self.assertEqual(list(page), [])
+        self.assertFalse(page.has_next())
+        self.assertFalse(page.has_other_pages())
+
+    def test_out_of_range_page_is_empty(self):
+        page = self._page(99)
+        self.assertEqual(list(page), [])
+        self.assertEqual(page.number, 99)
+        self.assertFalse(page.has_next())
+        self.assertTrue(page.has_previous())
+
+    def test_invalid_page_numbers_fall_back_to_first(self):
+        for value in ("abc", "0", "-3"):
+            with self.subTest(page=value):
+                self.assertEqual(self._page(value).number, 1)
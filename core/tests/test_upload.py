@@ -0,0 +1,300 @@
+"""
+Tests for document uploads: the hashing upload handlers in
+core/upload_handlers.py, the form path in core/views.py::upload_doc with its
+checksum de-duplication through the doc_sha_unique_per_org constraint, the
+direct-upload presign/finalize views, and the server-side verification of
+direct uploads in core/tasks.py.
+
+Files go to an in-memory storage (or the object hash is mocked) so no MinIO
+bucket is needed.
+
+Run with:
+docker compose exec web python manage.py test core.tests.test_upload --verbosity=2
+
+"""
+import hashlib
+from unittest import mock
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db import IntegrityError
+from django.test import SimpleTestCase, TestCase, Client, override_settings
+from django.urls import reverse
+
+from core.models import AuditLog, Document, Organisation, UserProfile, docs_page_cache_key
+from core.upload_handlers import Sha256MemoryFileUploadHandler, Sha256TemporaryFileUploadHandler
+
+IN_MEMORY_STORAGES = {
+    "default": {"BACKEND": "django.core.files.storage.InMemoryStorage"},
+    "staticfiles": {"BACKEND": "django.contrib.staticfiles.storage.StaticFilesStorage"},
+}
+
+
+@override_settings(STORAGES=IN_MEMORY_STORAGES)
+class UploadTestCase(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.org = Organisation.objects.create(name="Upload Org", mode="EXPLORATION")
+        self.user = User.objects.create_user("uploader", password="password123")
+        profile = self.user.profile
+        profile.role = UserProfile.RoleChoices.DATA_MANAGER
+        profile.organisation = self.org
+        profile.save()
+        self.client = Client()
+        self.client.force_login(self.user)
+        self.url = reverse("upload")
+
+    def _post(self, content=b"drill log bytes", organisation=None):
+        data = {
+            "title": "Field Notes",
+            "file": SimpleUploadedFile("notes.txt", content),
+            "confidentiality": "internal",
+        }
+        if organisation is not None:
+            data["organisation"] = organisation.pk
+        return self.client.post(self.url, data)
+
+
+class UploadDedupTests(UploadTestCase):
+    def test_first_upload_is_saved_with_checksum(self):
+        response = self._post(organisation=self.org)
+        self.assertRedirects(response, self.url, fetch_redirect_response=False)
+        doc = Document.objects.get()
+        self.assertEqual(doc.checksum_sha256, hashlib.sha256(b"drill log bytes").hexdigest())
+
+    def test_duplicate_in_same_organisation_is_rejected(self):
+        self._post(organisation=self.org)
+        response = self._post(organisation=self.org)
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, "Duplicate file detected")
+        self.assertEqual(Document.objects.count(), 1)
+
+    def test_duplicate_without_organisation_is_rejected(self):
+        """NULL organisations must not make the unique constraint let duplicates through."""
+        self._post()
+        response = self._post()
+        self.assertContains(response, "Duplicate file detected")
+        self.assertEqual(Document.objects.filter(organisation__isnull=True).count(), 1)
+
+    def test_same_file_in_another_organisation_is_allowed(self):
+        other_org = Organisation.objects.create(name="Other Org", mode="MINING")
+        self._post(organisation=self.org)
+        self._post(organisation=other_org)
+        self.assertEqual(Document.objects.count(), 2)
+
+    def test_other_integrity_errors_are_not_reported_as_duplicates(self):
+        with mock.patch.object(Document, "save", side_effect=IntegrityError("some other constraint")):
+            with self.assertRaises(IntegrityError):
+                self._post(organisation=self.org)
+        self.assertEqual(Document.objects.count(), 0)
+
+
+class DirectUploadTests(UploadTestCase):
+    """upload_presign / upload_finalize: bad fields must not leave objects behind in MinIO."""
+
+    def test_presign_rejects_invalid_fields_before_the_put(self):
+        with mock.patch("core.views.presign_upload_url") as presign:
+            response = self.client.post(reverse("upload_presign"), {"filename": "notes.pdf", "title": ""})
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("title", response.json()["errors"])
+        presign.assert_not_called()
+
+    def test_presign_reserves_key_for_valid_fields(self):
+        with mock.patch("core.views.presign_upload_url", return_value="http://minio/signed") as presign:
+            response = self.client.post(
+                reverse("upload_presign"), {"filename": "notes.pdf", "title": "Field Notes", "confidentiality": "internal"}
+            )
+        self.assertEqual(response.status_code, 200)
+        key = response.json()["key"]
+        presign.assert_called_once()
+        self.assertEqual(cache.get(f"upload:presign:{key}"), self.user.pk)
+
+    def test_invalid_finalize_deletes_reserved_object(self):
+        key = "docs/abc123/notes.pdf"
+        cache.set(f"upload:presign:{key}", self.user.pk)
+        with mock.patch("core.views.enqueue") as enqueue:
+            response = self.client.post(reverse("upload_finalize"), {"s3_key": key, "title": ""})
+        self.assertEqual(response.status_code, 400)
+        enqueue.assert_called_once_with(mock.ANY, key)
+        self.assertEqual(enqueue.call_args.args[0].__name__, "delete_storage_object")
+        self.assertIsNone(cache.get(f"upload:presign:{key}"))
+
+    def test_invalid_finalize_leaves_unreserved_object_alone(self):
+        key = "docs/abc123/notes.pdf"
+        cache.set(f"upload:presign:{key}", self.user.pk + 1)
+        with mock.patch("core.views.enqueue") as enqueue:
+            self.client.post(reverse("upload_finalize"), {"s3_key": key, "title": ""})
+        enqueue.assert_not_called()
+
+
+class UploadHandlerTests(UploadTestCase):
+    """
+    A real multipart body through the test client, so the hashing handlers see
+    the chunks Django's parser actually produces.
+    """
+
+    def _capture(self, handler_class):
+        """Patch handler_class so every UploadedFile it completes is appended to the returned list."""
+        uploads = []
+        original = handler_class.file_complete
+
+        def file_complete(handler, file_size):
+            uploaded = original(handler, file_size)
+            if uploaded is not None:
+                uploads.append(uploaded)
+            return uploaded
+
+        return mock.patch.object(handler_class, "file_complete", file_complete), uploads
+
+    def _assert_hashed_by(self, handler_class, body):
+        patcher, uploads = self._capture(handler_class)
+        with patcher:
+            self._post(content=body, organisation=self.org)
+
+        self.assertEqual(len(uploads), 1)
+        upload = uploads[0]
+        self.assertEqual(upload.size, len(body))
+        self.assertEqual(upload.sha256, hashlib.sha256(body).hexdigest())
+        doc = Document.objects.get()
+        self.assertEqual(doc.checksum_sha256, upload.sha256)
+        self.assertEqual(doc.checksum_tree, upload.sha256_tree)
+
+    def test_small_upload_is_hashed_in_memory(self):
+        self._assert_hashed_by(Sha256MemoryFileUploadHandler, b"collar survey " * 40)
+
+    @override_settings(FILE_UPLOAD_MAX_MEMORY_SIZE=1024)
+    def test_large_upload_is_hashed_while_spooled_to_disk(self):
+        # several parser chunks (64KB each), so hashing has to follow every one of them
+        body = bytes(range(256)) * 1024
+        self._assert_hashed_by(Sha256TemporaryFileUploadHandler, body)
+
+    @override_settings(FILE_UPLOAD_MAX_MEMORY_SIZE=1024)
+    def test_memory_handler_passes_large_upload_on_unhashed(self):
+        patcher, uploads = self._capture(Sha256MemoryFileUploadHandler)
+        with patcher:
+            self._post(content=b"x" * 4096, organisation=self.org)
+        self.assertEqual(uploads, [])
+        self.assertEqual(Document.objects.get().checksum_sha256, hashlib.sha256(b"x" * 4096).hexdigest())
+
+
+class ComputeDocumentChecksumTests(TestCase):
+    """Server-side verification of direct uploads (core/tasks.py::compute_document_checksum)."""
+
+    def setUp(self):
+        cache.clear()
+        self.org = Organisation.objects.create(name="Verify Org", mode="EXPLORATION")
+        self.user = User.objects.create_user("direct-uploader", password="password123")
+        self.digest = hashlib.sha256(b"stored bytes").hexdigest()
+        self.tree = hashlib.sha256(hashlib.sha256(b"stored bytes").digest()).hexdigest()
+
+    def _make_doc(self, key="docs/abc/report.pdf"):
+        # a direct upload: the object is already in storage, the row has no checksum
+        return Document.objects.create(title="Direct", file=key, organisation=self.org, created_by=self.user)
+
+    def _run(self, doc, claimed=""):
+        from core.tasks import compute_document_checksum
+
+        with mock.patch("core.utils.object_checksums", return_value=(self.digest, self.tree)):
+            compute_document_checksum(doc.pk, claimed)
+
+    def test_server_digest_is_stored(self):
+        doc = self._make_doc()
+        self._run(doc, claimed=self.digest)
+        doc.refresh_from_db()
+        self.assertEqual(doc.checksum_sha256, self.digest)
+        self.assertEqual(doc.checksum_tree, self.tree)
+
+    def test_unclaimed_upload_is_hashed(self):
+        doc = self._make_doc()
+        self._run(doc)
+        doc.refresh_from_db()
+        self.assertEqual(doc.checksum_sha256, self.digest)
+
+    def _assert_rejected(self, doc, reason):
+        self.assertFalse(Document.objects.filter(pk=doc.pk).exists())
+        entry = AuditLog.objects.get(action=AuditLog.ActionType.REJECT, object_id=doc.pk)
+        self.assertEqual(entry.user, self.user)
+        self.assertIn('"Direct"', entry.description)
+        self.assertIn(reason, entry.description)
+
+    def test_mismatched_claim_removes_document(self):
+        doc = self._make_doc()
+        self._run(doc, claimed="0" * 64)
+        self._assert_rejected(doc, "does not match")
+
+    def test_removal_drops_cached_documents_page(self):
+        doc = self._make_doc()
+        cache.set(docs_page_cache_key(self.org.id), ["stale page"])
+        cache.set(docs_page_cache_key("all"), ["stale page"])
+        self._run(doc, claimed="0" * 64)
+        self.assertIsNone(cache.get(docs_page_cache_key(self.org.id)))
+        self.assertIsNone(cache.get(docs_page_cache_key("all")))
+
+    def test_removed_upload_is_listed_on_upload_page(self):
+        profile = self.user.profile
+        profile.role = UserProfile.RoleChoices.DATA_MANAGER
+        profile.organisation = self.org
+        profile.save()
+        doc = self._make_doc()
+        self._run(doc, claimed="0" * 64)
+
+        client = Client()
+        client.force_login(self.user)
+        response = client.get(reverse("upload"))
+        self.assertContains(response, "Removed after upload")
+        self.assertEqual(len(response.context["rejected_uploads"]), 1)
+
+    def test_duplicate_of_existing_document_is_removed(self):
+        existing = Document.objects.create(
+            title="Original", file="docs/old/report.pdf", organisation=self.org, checksum_sha256=self.digest
+        )
+        doc = self._make_doc()
+        self._run(doc, claimed=self.digest)
+        self._assert_rejected(doc, "duplicate file detected")
+        self.assertTrue(Document.objects.filter(pk=existing.pk).exists())
+
+
+class ObjectTreeHashTests(SimpleTestCase):
+    """object_checksums derives a one-part tree from the whole digest; it must match
+    what HashingFile computes while storing a form upload."""
+
+    def _in_pass_tree(self, content):
+        from core.utils import HashingFile
+
+        tee = HashingFile(SimpleUploadedFile("part.bin", content))
+        while tee.read(4096):
+            pass
+        return tee.hexdigest(), tee.tree_hexdigest()
+
+    def _derived_tree(self, content):
+        from core.utils import object_checksums
+
+        digest = hashlib.sha256(content).hexdigest()
+        with mock.patch("core.utils.sha256_object", return_value=digest), \
+                mock.patch("django.core.files.storage.default_storage") as storage:
+            storage.size.return_value = len(content)
+            return object_checksums("docs/x/part.bin")
+
+    def test_single_part_matches_in_pass_tree(self):
+        self.assertEqual(self._derived_tree(b"assay results"), self._in_pass_tree(b"assay results"))
+
+    def test_empty_object_matches_in_pass_tree(self):
+        self.assertEqual(self._derived_tree(b""), self._in_pass_tree(b""))
+
+
+class PresignClientTests(SimpleTestCase):
+    def setUp(self):
+        from core.utils import _presign_client
+
+        _presign_client.cache_clear()
+        self.addCleanup(_presign_client.cache_clear)
+
+    def test_signing_client_is_built_once(self):
+        from core.utils import presign_upload_url
+
+        with mock.patch("boto3.client") as make_client:
+            make_client.return_value.generate_presigned_url.side_effect = lambda op, Params, ExpiresIn: Params["Key"]
+            urls = [presign_upload_url(f"docs/{n}/notes.pdf") for n in range(3)]
+        self.assertEqual(urls, [f"docs/{n}/notes.pdf" for n in range(3)])
+        make_client.assert_called_once()
@@ -0,0 +1,49 @@
+"""
+Upload handlers that SHA-256 the file while Django is receiving it, so the
+checksum is ready once the form validates and upload_doc doesn't have to
+read the whole file a second time.
+
+The digest is attached to the resulting UploadedFile as `.sha256`, and the
+tree hash (see utils.sha256_tree) as `.sha256_tree`.
+"""
+import hashlib
+
+from django.core.files.uploadhandler import (
+    MemoryFileUploadHandler,
+    TemporaryFileUploadHandler,
+)
+
+from .utils import TreeHasher
+
+
+class Sha256UploadMixin:
+    def new_file(self, *args, **kwargs):
+        # set up first: an activated MemoryFileUploadHandler.new_file raises
+        # StopFutureHandlers
+        self._sha = hashlib.sha256()
+        self._tree = TreeHasher()
+        super().new_file(*args, **kwargs)
+
+    def receive_data_chunk(self, raw_data, start):
+        out = super().receive_data_chunk(raw_data, start)
+        # None means this handler consumed the chunk; anything else is passed
+        # on to the next handler, which does the hashing instead
+        if out is None:
+            self._sha.update(raw_data)
+            self._tree.update(raw_data)
+        return out
+
+    def file_complete(self, file_size):
+        uploaded = super().file_complete(file_size)
+        if uploaded is not None:
+            uploaded.sha256 = self._sha.hexdigest()
+            uploaded.sha256_tree = self._tree.hexdigest()
+        return uploaded
+
+
+class Sha256MemoryFileUploadHandler(Sha256UploadMixin, MemoryFileUploadHandler):
+    """Small uploads kept in memory."""
+
+
+class Sha256TemporaryFileUploadHandler(Sha256UploadMixin, TemporaryFileUploadHandler):
+    """Large uploads spooled to a temporary file."""
@@ -20,10 +20,13 @@ urlpatterns = [
     path("map/", views.map_view, name="map_view"),
     path("ai-insights/", views.ai_insights, name="ai_insights"),
     path("upload/", views.upload_doc, name="upload"),
+    path("upload/presign/", views.upload_presign, name="upload_presign"),
+    path("upload/finalize/", views.upload_finalize, name="upload_finalize"),
 
     # PDF / DOCX direct download by process
     path("ai/report/<uuid:process_id>/pdf/", views.project_report_pdf,  name="project_report_pdf"),
     path("ai/report/<uuid:process_id>/docx/", views.project_report_docx, name="project_report_docx"),
+    path("ai/report/<uuid:process_id>/stream/", views.project_report_stream, name="project_report_stream"),
 
     # Report History
     path("process/<uuid:process_id>/reports/history/", views.report_history, name="report_history"),
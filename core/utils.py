@@ -1,31 +1,245 @@
 import hashlib
+import mmap
+import os
 import pdfplumber
 import logging
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+
+from django.core.files import File
 
 from django.contrib.gis.db import models
 
 
+HASH_CHUNK_SIZE = 1024 * 1024  # 1 MiB reads for the manual hashing fallback
+
+
+def _sha256_mapped(path) -> str:
+    # file already spooled to disk (TemporaryUploadedFile): hash the page cache
+    # through a read-only mapping instead of copying it into Python buffers
+    with open(path, "rb", buffering=0) as fh:
+        if os.fstat(fh.fileno()).st_size == 0:
+            return hashlib.sha256().hexdigest()  # mmap can't map an empty file
+        with mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            return hashlib.sha256(mm).hexdigest()
+
+
 def sha256_file(django_file) -> str:
     pos = django_file.tell()  # remember current position
-    django_file.seek(0)
+    try:
+        if hasattr(django_file, "temporary_file_path"):
+            return _sha256_mapped(django_file.temporary_file_path())
 
-    h = hashlib.sha256()
+        django_file.seek(0)
+        try:
+            # Python 3.11+: hashes straight from the underlying file/buffer inside
+            # OpenSSL without building Python-level chunks. Django File wrappers
+            # expose the real file object as .file
+            raw = getattr(django_file, "file", django_file)
+            raw.seek(0)
+            return hashlib.file_digest(raw, "sha256").hexdigest()
+        except (AttributeError, ValueError, TypeError):
+            # older Python or a file object file_digest can't read from
+            django_file.seek(0)
+            h = hashlib.sha256()
+
+            raw = getattr(django_file, "file", django_file)
+            if hasattr(raw, "readinto"):
+                # one reusable buffer instead of a new bytes object per chunk
+                buf = bytearray(HASH_CHUNK_SIZE)
+                view = memoryview(buf)
+                raw.seek(0)
+                while n := raw.readinto(buf):
+                    h.update(view[:n])
+            # Use chunks() if available (IMPORTANT for uploaded files)
+            elif hasattr(django_file, "chunks"):
+                for chunk in django_file.chunks(chunk_size=HASH_CHUNK_SIZE):
+                    if chunk:
+                        h.update(memoryview(chunk))
+            else:
+                # fallback for non-uploaded file objects
+                for chunk in iter(lambda: django_file.read(HASH_CHUNK_SIZE), b""):
+                    h.update(memoryview(chunk))
+            return h.hexdigest()
+    finally:
+        django_file.seek(pos)  # restore pointer
+
+# part size for the tree hash (checksum_tree): root = sha256(concat(sha256(part_i)))
+TREE_PART_SIZE = 8 * 1024 * 1024
+
+def _tree_root(part_digests) -> str:
+    return hashlib.sha256(b"".join(part_digests)).hexdigest()
+
+def sha256_tree(
+    key: str, part_size: int = TREE_PART_SIZE, max_workers: int | None = None, size: int | None = None
+) -> str:
+    """
+    Tree hash of an object already in MinIO. Each part is fetched with a ranged
+    get_object and hashed on its own thread, so big files aren't limited to one
+    core / one stream. Pass `size` if it is already known to skip the HEAD.
+    """
+    from django.core.files.storage import default_storage
+
+    client = default_storage.connection.meta.client
+    bucket = default_storage.bucket_name
+    if size is None:
+        size = client.head_object(Bucket=bucket, Key=key)["ContentLength"]
 
-    # Use chunks() if available (IMPORTANT for uploaded files)
-    if hasattr(django_file, "chunks"):
-        for chunk in django_file.chunks():
-            if chunk:
-                h.update(chunk)
-    else:
-        # fallback for non-uploaded file objects
-        for chunk in iter(lambda: django_file.read(8192), b""):
+    def _part(start):
+        end = min(start + part_size, size) - 1
+        body = client.get_object(Bucket=bucket, Key=key, Range=f"bytes={start}-{end}")["Body"]
+        h = hashlib.sha256()
+        for chunk in iter(lambda: body.read(1024 * 1024), b""):
             h.update(chunk)
+        return h.digest()
+
+    if size <= part_size:
+        # small file: one request, no pool
+        return _tree_root([_part(0)] if size else [])
 
-    django_file.seek(pos)  # restore pointer
+    with ThreadPoolExecutor(max_workers=max_workers or os.cpu_count()) as pool:
+        return _tree_root(pool.map(_part, range(0, size, part_size)))
+
+def sha256_readahead(fileobj, chunk_size: int = HASH_CHUNK_SIZE) -> str:
+    """
+    SHA-256 of a sequential stream with one chunk of read-ahead: the next read
+    runs on a worker thread while the current chunk is hashed (hashlib drops
+    the GIL on large buffers), so network / disk wait overlaps with hashing.
+    """
+    h = hashlib.sha256()
+    with ThreadPoolExecutor(max_workers=1) as pool:
+        pending = pool.submit(fileobj.read, chunk_size)
+        while chunk := pending.result():
+            pending = pool.submit(fileobj.read, chunk_size)
+            h.update(chunk)
     return h.hexdigest()
 
+def violated_constraint(exc):
+    """Name of the constraint behind an IntegrityError (psycopg2 diagnostics), if known."""
+    diag = getattr(exc.__cause__, "diag", None)
+    return getattr(diag, "constraint_name", None)
+
+def sha256_object(key: str) -> str:
+    """
+    Whole-object SHA-256 of a file in MinIO, streamed straight from get_object
+    (S3File.open would first download the object into a local spool file).
+    """
+    from django.core.files.storage import default_storage
+
+    client = default_storage.connection.meta.client
+    body = client.get_object(Bucket=default_storage.bucket_name, Key=key)["Body"]
+    try:
+        return sha256_readahead(body)
+    finally:
+        body.close()
+
+def object_checksums(key: str) -> tuple[str, str]:
+    """
+    (checksum_sha256, checksum_tree) for an object in MinIO. Objects bigger than
+    one tree part have their parts hashed in parallel by sha256_tree while the
+    whole-object digest streams on this thread; a one-part tree is derived from
+    the whole digest without reading the object again.
+    """
+    from django.core.files.storage import default_storage
+
+    size = default_storage.size(key)
+    if size <= TREE_PART_SIZE:
+        digest = sha256_object(key)
+        return digest, _tree_root([bytes.fromhex(digest)] if size else [])
+    with ThreadPoolExecutor(max_workers=1) as pool:
+        tree = pool.submit(sha256_tree, key, size=size)
+        digest = sha256_object(key)
+        return digest, tree.result()
+
+class TreeHasher:
+    """Incremental tree hash: bytes fed in order are digested per TREE_PART_SIZE part."""
+    def __init__(self, part_size: int = TREE_PART_SIZE):
+        self._part_size = part_size
+        self._part = hashlib.sha256()
+        self._part_len = 0
+        self._parts = []
+
+    def update(self, data):
+        view = memoryview(data)
+        while view:
+            take = view[: self._part_size - self._part_len]
+            self._part.update(take)
+            self._part_len += len(take)
+            view = view[len(take):]
+            if self._part_len == self._part_size:
+                self._parts.append(self._part.digest())
+                self._part = hashlib.sha256()
+                self._part_len = 0
+
+    def hexdigest(self) -> str:
+        return _tree_root(self._parts + ([self._part.digest()] if self._part_len else []))
+
+class HashingFile(File):
+    """
+    Wraps an upload so storage reads also feed a SHA-256 (and the per-part
+    digests for the tree hash), hashing the file in the same pass that writes
+    it to MinIO. Only bytes read in order count, so a retrying uploader that
+    seeks back leaves hexdigest() as None.
+    """
+    def __init__(self, file, part_size: int = TREE_PART_SIZE):
+        super().__init__(file, name=file.name)
+        self.content_type = getattr(file, "content_type", None)
+        self._hash = hashlib.sha256()
+        self._hashed = 0
+        self._tree = TreeHasher(part_size)
+
+    def read(self, *args):
+        pos = self.file.tell()
+        data = self.file.read(*args)
+        if pos == self._hashed:
+            self._hash.update(data)
+            self._hashed += len(data)
+            self._tree.update(data)
+        return data
+
+    def hexdigest(self):
+        return self._hash.hexdigest() if self._hashed == self.size else None
+
+    def tree_hexdigest(self):
+        return self._tree.hexdigest() if self._hashed == self.size else None
+
 log = logging.getLogger(__name__)
 
+@lru_cache(maxsize=4)
+def _presign_client(endpoint_url: str):
+    """
+    S3 client used only for signing, one per endpoint. Building a client loads
+    the botocore service model, so it is done once per process, not per
+    request; boto3 clients are safe to share between threads.
+    """
+    import boto3
+    from botocore.config import Config
+    from django.conf import settings
+
+    opts = settings.STORAGES["default"]["OPTIONS"]
+    return boto3.client(
+        "s3",
+        endpoint_url=endpoint_url,
+        aws_access_key_id=opts["access_key"],
+        aws_secret_access_key=opts["secret_key"],
+        region_name="us-east-1",
+        config=Config(**opts["client_config"], signature_version="s3v4"),
+    )
+
+def presign_upload_url(key: str, expires_in: int = 600) -> str:
+    """
+    Presigned PUT URL so the browser can upload straight to MinIO.
+    Reuses the default storage credentials but signs against the external endpoint.
+    """
+    from django.conf import settings
+
+    client = _presign_client(settings.MINIO_PRESIGN_ENDPOINT_URL)
+    return client.generate_presigned_url(
+        "put_object",
+        Params={"Bucket": settings.STORAGES["default"]["OPTIONS"]["bucket_name"], "Key": key},
+        ExpiresIn=expires_in,
+    )
+
 def extract_text(file_field) -> str:
     """
     Extract plain text from supported document types.
@@ -0,0 +1,26 @@
+"""
+Time-ordered UUIDs (version 7, RFC 9562) for primary keys.
+
+Random uuid4 keys land on a random btree leaf for every insert; uuid7 keys
+start with a millisecond timestamp, so new rows append to the right-hand side
+of the index instead. Python only ships uuid.uuid7 from 3.14.
+"""
+import os
+import time
+import uuid
+
+_RAND_B_MASK = (1 << 62) - 1
+
+
+def uuid7() -> uuid.UUID:
+    """48-bit unix ms timestamp | ver 7 | 12 random bits | variant | 62 random bits"""
+    ms = time.time_ns() // 1_000_000
+    rand = int.from_bytes(os.urandom(10), "big")  # 80 bits, 74 used
+    value = (
+        (ms & 0xFFFF_FFFF_FFFF) << 80
+        | 0x7 << 76
+        | (rand >> 68) << 64
+        | 0b10 << 62
+        | (rand & _RAND_B_MASK)
+    )
+    return uuid.UUID(int=value)
@@ -5,20 +5,27 @@ from pydoc import doc
 from django.apps import apps
 from django.contrib.auth.decorators import login_required
 from django.views.decorators.http import require_POST
-from django.core.paginator import Paginator
+from django.db import IntegrityError, connection, transaction
 from django.db.models import Q
 from django.core.exceptions import PermissionDenied
-from django.http import Http404, HttpResponse, JsonResponse, HttpResponseBadRequest
+from django.http import Http404, HttpResponse, JsonResponse, HttpResponseBadRequest, StreamingHttpResponse
 from django.urls import reverse
-from django.views.decorators.http import require_GET, require_http_methods
+from django.views.decorators.cache import cache_control
+from django.views.decorators.http import condition, require_GET, require_http_methods
 from django.contrib import messages
 from django.core.cache import cache
+from django.core.files.storage import default_storage
+from django.utils import timezone
+from django.utils.text import get_valid_filename
 from django.shortcuts import render, get_object_or_404, redirect
-from core.ai.report_service import generate_project_report
-from .ai.granite_client import GraniteClient
+from core.ai.report_service import generate_project_report, stream_project_report
 
-from types import SimpleNamespace
+import datetime
+import functools
+import hashlib
 import logging
+import os
+import uuid
 
 # Exporting report
 from reportlab.lib.pagesizes import A4
@@ -33,20 +40,24 @@ import re, io
 
 from django.contrib.contenttypes.models import ContentType
 from django.contrib.postgres.search import SearchQuery, SearchRank
-from .forms import DocumentForm, DocumentSearchForm
-from .models import Document, Process, SavedReport, AuditLog, log_audit, Prospect, DocLink, UserProfile
-from .permissions import role_required, clearance_required, log_view_access
-from .utils import sha256_file, extract_text, chunk_text
+from .forms import DocumentForm, DocumentSearchForm, DirectUploadForm, DocumentMetadataForm
+from .models import Document, Organisation, Process, SavedReport, AuditLog, log_audit, Prospect, DocLink, UserProfile, recent_cache_key, docs_page_cache_key, _content_type_for
+from .permissions import role_required, clearance_required, log_view_access, get_user_ip
+from .utils import extract_text, chunk_text, presign_upload_url, violated_constraint
 
 from .tagging import TAG_LABEL
+from .tasks import enqueue, enqueue_report_warm, delete_storage_object
 
 
 # ---------- Helpers ----------
 
 
+@functools.cache
 def _get_model(app_label: str, model_name: str):
     """
     Best-effort dynamic model fetch (lets views work even if model doesn’t exist yet).
+    The registry doesn't change once the app is running, so each lookup
+    (including a miss) is remembered for the life of the process.
     """
     try:
         return apps.get_model(app_label, model_name)
@@ -54,17 +65,48 @@ def _get_model(app_label: str, model_name: str):
         return None
 
 
-def _count_model(app_label: str, model_name: str, where_clause: str = None) -> int:
-    mdl = _get_model(app_label, model_name)
-    if mdl is None:
-        return 0
-    return mdl.objects.count()
+class CountlessPage:
+    """
+    Prev/next-only page: fetches per_page + 1 rows to learn whether there is a
+    next page, so no SELECT COUNT(*) over the (filtered) queryset is needed.
+    Mirrors the parts of django.core.paginator.Page the list templates use.
+    """
+
+    def __init__(self, object_list, number: int, has_next: bool):
+        self.object_list = object_list
+        self.number = number
+        self._has_next = has_next
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def has_next(self):
+        return self._has_next
 
+    def has_previous(self):
+        return self.number > 1
 
-def _paginate(queryset, request, per_page: int = 20):
-    paginator = Paginator(queryset, per_page)
-    page_number = request.GET.get("page")
-    return paginator.get_page(page_number)
+    def has_other_pages(self):
+        return self.has_next() or self.has_previous()
+
+    def next_page_number(self):
+        return self.number + 1
+
+    def previous_page_number(self):
+        return self.number - 1
+
+
+def _paginate(queryset, request, per_page: int = 20) -> CountlessPage:
+    try:
+        number = max(int(request.GET.get("page", 1)), 1)
+    except (TypeError, ValueError):
+        number = 1
+    offset = (number - 1) * per_page
+    rows = list(queryset[offset:offset + per_page + 1])
+    return CountlessPage(rows[:per_page], number, has_next=len(rows) > per_page)
 
 
 def _org_qs_filter(request):
@@ -83,6 +125,125 @@ def _org_qs_filter(request):
     return Q(pk__in=[])
 
 
+# ---------- Dashboard metrics ----------
+
+DASHBOARD_METRICS_TTL = 30  # seconds
+# unscoped (superuser) counts switch to the planner's row estimate
+# (pg_class.reltuples) once a table is this big; exact below that
+APPROX_COUNT_MIN = 100_000
+
+# metric key -> model name; models that don't exist (yet) report 0
+_METRIC_MODELS = (
+    ("project_count", "Process"),
+    ("document_count", "Document"),
+    ("prospect_count", "Prospect"),
+    ("drillhole_count", "Drillhole"),
+    ("tenement_count", "Tenement"),
+)
+
+
+@functools.cache
+def _dashboard_metrics_sql(scoped: bool) -> tuple[tuple[str, ...], str]:
+    """
+    One SELECT of scalar COUNT subqueries for every available metric model,
+    built once per process. `scoped` adds the organisation filter; unscoped
+    counts on large tables read the estimate instead of scanning.
+    """
+    keys, parts = [], []
+    for key, model_name in _METRIC_MODELS:
+        mdl = _get_model("core", model_name)
+        if mdl is None:
+            continue
+        table = connection.ops.quote_name(mdl._meta.db_table)
+        where = ""
+        if scoped:
+            org_col = connection.ops.quote_name(mdl._meta.get_field("organisation").column)
+            where = f" WHERE {org_col} = %(org)s"
+        exact = f"(SELECT COUNT(*) FROM {table}{where})"
+        if not scoped:
+            # the ELSE subquery is only run when the estimate is too small to trust
+            # (reltuples is -1 until the table has been analysed)
+            exact = (
+                f"(SELECT CASE WHEN reltuples >= {APPROX_COUNT_MIN} THEN reltuples::bigint "
+                f"ELSE {exact} END FROM pg_class WHERE oid = '{table}'::regclass)"
+            )
+        keys.append(key)
+        parts.append(exact)
+    return tuple(keys), "SELECT " + ", ".join(parts)
+
+
+def _dashboard_metrics(request) -> dict:
+    """
+    Dashboard card counts in a single round-trip, cached briefly per organisation
+    (same scoping as _org_qs_filter).
+    """
+    metrics = dict.fromkeys((key for key, _ in _METRIC_MODELS), 0)
+    if request.user.is_superuser:
+        org_id = None
+    else:
+        profile = getattr(request.user, "profile", None)
+        org_id = profile.organisation_id if profile else None
+        if org_id is None:
+            return metrics  # no organisation -> sees nothing
+
+    def compute():
+        keys, sql = _dashboard_metrics_sql(org_id is not None)
+        with connection.cursor() as cursor:
+            cursor.execute(sql, {"org": org_id})
+            row = cursor.fetchone()
+        return dict(zip(keys, row))
+
+    metrics.update(cache.get_or_set(f"dashboard:metrics:v1:{org_id or 'all'}", compute, DASHBOARD_METRICS_TTL))
+    return metrics
+
+
+RECENT_CACHE_TTL = 30  # seconds; core.models.invalidate_recent_lists clears on change
+RECENT_LIMIT = 12  # longest "recent" list any page shows; shorter ones slice it
+
+# columns the "recent" cards actually render; keeps geom / extracted_text /
+# search_tsv out of the query and out of the cached pickles
+_RECENT_FIELDS = {
+    Document: ("id", "title", "created_at"),
+    Process: ("id", "name", "mode", "commodity", "created_at"),
+}
+
+
+def _recent(request, model, limit: int) -> list:
+    """
+    Newest `limit` rows of `model` visible to the user, from a short-lived
+    per-organisation cache shared by the landing, dashboard and AI pages.
+    """
+    if request.user.is_superuser:
+        scope = "all"
+    else:
+        profile = getattr(request.user, "profile", None)
+        scope = profile.organisation_id if profile else None
+        if scope is None:
+            return []  # no organisation -> sees nothing
+    rows = cache.get_or_set(
+        recent_cache_key(model, scope),
+        lambda: list(
+            model.objects.filter(_org_qs_filter(request))
+            .only(*_RECENT_FIELDS[model])
+            .order_by("-created_at")[:RECENT_LIMIT]
+        ),
+        RECENT_CACHE_TTL,
+    )
+    return rows[:limit]
+
+
+def _dashboard_etag(request, recent: int = 0) -> str:
+    """
+    ETag over everything the dashboard cards render: the user, the cached
+    counts and, for the full page, the cached recent list. Both come from the
+    cache, so a matching If-None-Match costs no queries and no template render.
+    """
+    parts = [request.user.pk, request.user.get_username(), sorted(_dashboard_metrics(request).items())]
+    if recent:
+        parts.append([(d.pk, d.title, d.created_at) for d in _recent(request, Document, recent)])
+    return hashlib.md5(repr(parts).encode(), usedforsecurity=False).hexdigest()
+
+
 # ---------- Landing / Dashboard ----------
 
 
@@ -92,9 +253,8 @@ def home(request):
     """
     Simple landing that shows recent Projects & Documents (as per your snippet).
     """
-    org_filter = _org_qs_filter(request)
-    projects = Process.objects.filter(org_filter).order_by("-created_at")[:10]
-    docs = Document.objects.filter(org_filter).order_by("-created_at")[:10]
+    projects = _recent(request, Process, 10)
+    docs = _recent(request, Document, 10)
     return render(
         request,
         "core/home.html",
@@ -104,22 +264,14 @@ def home(request):
 
 @login_required
 @require_GET
+@cache_control(private=True, no_cache=True)
+@condition(etag_func=lambda request: _dashboard_etag(request, recent=8))
 def dashboard(request):
     """
     Dashboard cards + quick links. Works even if domain models aren’t ready yet.
     """
-    org_filter = _org_qs_filter(request)
-    Prospect = _get_model("core", "Prospect")
-    Drillhole = _get_model("core", "Drillhole")
-    Tenement = _get_model("core", "Tenement")
-    metrics = {
-        "project_count": Process.objects.filter(org_filter).count(),
-        "document_count": Document.objects.filter(org_filter).count(),
-        "prospect_count": Prospect.objects.filter(org_filter).count() if Prospect else 0,
-        "drillhole_count": Drillhole.objects.filter(org_filter).count() if Drillhole else 0,
-        "tenement_count": Tenement.objects.filter(org_filter).count() if Tenement else 0,
-    }
-    recent_docs = Document.objects.filter(org_filter).order_by("-created_at")[:8]
+    metrics = _dashboard_metrics(request)
+    recent_docs = _recent(request, Document, 8)
     return render(
         request,
         "core/dashboard.html",
@@ -130,36 +282,25 @@ def dashboard(request):
 # Optional: HTMX endpoint to refresh stats without reloading the whole page
 @login_required
 @require_GET
+@cache_control(private=True, no_cache=True)
+@condition(etag_func=_dashboard_etag)
 def stats_partial(request):
-    org_filter = _org_qs_filter(request)
-    Prospect = _get_model("core", "Prospect")
-    Drillhole = _get_model("core", "Drillhole")
-    Tenement = _get_model("core", "Tenement")
-    ctx = {
-        "project_count": Process.objects.filter(org_filter).count(),
-        "document_count": Document.objects.filter(org_filter).count(),
-        "prospect_count": Prospect.objects.filter(org_filter).count() if Prospect else 0,
-        "drillhole_count": Drillhole.objects.filter(org_filter).count() if Drillhole else 0,
-        "tenement_count": Tenement.objects.filter(org_filter).count() if Tenement else 0,
-    }
-    return render(request, "core/partials/stats.html", ctx)
+    return render(request, "core/partials/stats.html", _dashboard_metrics(request))
 
 
 # ---------- Cache keys ----------
 
-DOCS_CACHE_KEY = "docs:unfiltered:page1:v1"
 DOCS_CACHE_TTL = 120  # 2 minutes
 
 
 def _docs_cache_key(request):
     """Per-organisation cache key so users only see their own org's cached documents."""
     if request.user.is_superuser:
-        return "docs:unfiltered:page1:v1:all"
+        return docs_page_cache_key("all")
     org = None
     if request.user.is_authenticated and hasattr(request.user, 'profile'):
         org = request.user.profile.organisation
-    org_id = str(org.id) if org else "noorg"
-    return f"docs:unfiltered:page1:v1:{org_id}"
+    return docs_page_cache_key(org.id if org else "noorg")
 
 
 # ---------- Documents ----------
@@ -174,35 +315,48 @@ def _get_clearance_level(request) -> str:
     return "PUBLIC"
 
 
-def _report_cache_key(process_id: str, clearance_level: str, latest_doc_ts) -> str:
-    doc_fingerprint = latest_doc_ts.strftime("%Y%m%d%H%M%S%f") if latest_doc_ts else "empty"
-    return f"report:v1:{process_id}:{clearance_level}:{doc_fingerprint}"
-
-
 def _get_cached_report_md(process_id: str, clearance_level: str) -> str:
     """
-    return the cached report markdown for this project + clearance combination, generating and caching if not already existing
+    return the report markdown for this project + clearance combination.
 
-    cache key includes a content fingerprint (latest document upload timestamp)
-    so the cache self-invalidates whenever a new document is added to the project
+    generate_project_report caches on a content fingerprint (latest process or
+    document update plus document count), so this self-invalidates whenever
+    a document is added, edited or removed
     """
-    latest_doc_ts = (
-        Document.objects
-        .filter(process_id=process_id)
-        .order_by("-created_at")
-        .values_list("created_at", flat=True)
-        .first()
-    )
-    cache_key = _report_cache_key(process_id, clearance_level, latest_doc_ts)
+    return generate_project_report(process_id, clearance_level=clearance_level)
 
-    md = cache.get(cache_key)
-    if md is None:
-        md = generate_project_report(process_id, clearance_level=clearance_level)
-        cache.set(cache_key, md, 86400)  # 24 hours
-    return md
+def _finish_upload(request, doc):
+    """
+    Post-save steps shared by the form upload and the direct (presigned) upload:
+    RAG chunks, document list cache invalidation and report pre-warm.
+    """
+    # Build text chunks for RAG retrieval
+    if doc.extracted_text:
+        from .models import DocumentChunk
+        chunks = chunk_text(doc.extracted_text)
+        DocumentChunk.objects.bulk_create([
+            DocumentChunk(
+            document=doc,
+            chunk_index=i,
+            text=chunk,
+            process=doc.process,
+            doc_type=doc.doc_type,
+            timestamp=doc.timestamp,
+            )
+            for i, chunk in enumerate(chunks)
+        ])
 
-@login_required
-@role_required(
+    # Invalidate the unfiltered document list cache so the new doc appears immediately
+    cache.delete(_docs_cache_key(request))
+
+    # Pre-warm the report cache for this project in the background, so the
+    # upload response doesn't wait on the LLM. If Granite is unavailable the
+    # report is generated on the first view request instead
+    if doc.process_id:
+        enqueue_report_warm(str(doc.process_id), _get_clearance_level(request))
+
+
+_UPLOAD_ROLES = (
     UserProfile.RoleChoices.GEOLOGIST_EXPL,
     UserProfile.RoleChoices.FIELD_LEAD,
     UserProfile.RoleChoices.DATA_MANAGER,
@@ -211,6 +365,38 @@ def _get_cached_report_md(process_id: str, clearance_level: str) -> str:
     UserProfile.RoleChoices.OPERATIONS_MANAGER,
     UserProfile.RoleChoices.ADMIN,
 )
+
+
+def _upload_sidebar_docs(request):
+    """
+    Latest uploads listed beside the upload form (title, date and file link
+    only). A blank checksum marks a direct upload still being verified.
+    """
+    return (
+        Document.objects.filter(_org_qs_filter(request))
+        .only("id", "title", "file", "created_at", "checksum_sha256")
+        .order_by("-created_at")[:20]
+    )
+
+
+REJECTED_UPLOADS_WINDOW = datetime.timedelta(days=1)
+
+
+def _rejected_uploads(request):
+    """This user's recent uploads that verification removed (tasks.reject_upload)."""
+    return (
+        AuditLog.objects.filter(
+            user=request.user,
+            action=AuditLog.ActionType.REJECT,
+            content_type=_content_type_for(Document),
+            timestamp__gte=timezone.now() - REJECTED_UPLOADS_WINDOW,
+        )
+        .only("description", "timestamp")[:5]
+    )
+
+
+@login_required
+@role_required(*_UPLOAD_ROLES)
 @require_http_methods(["GET", "POST"])
 def upload_doc(request):
     """
@@ -229,25 +415,14 @@ def upload_doc(request):
             doc.extracted_text = ""
 
             if doc.file:
-                # Important: call sha256_file on the uploaded file *before* saving
-                doc.checksum_sha256 = sha256_file(doc.file)
+                # The upload handlers hash the file while it streams in. Anything
+                # they didn't see is hashed by Document.save() in the same pass
+                # that writes it to storage, so there is never a separate read here
+                upload = form.cleaned_data.get("file")
+                doc.checksum_sha256 = getattr(upload, "sha256", "")
+                doc.checksum_tree = getattr(upload, "sha256_tree", "")
                 doc.extracted_text = extract_text(doc.file) or ""
 
-            if doc.checksum_sha256 and Document.objects.filter(
-                checksum_sha256=doc.checksum_sha256
-            ).exists():
-                # Duplicate detected — re-render with error + keep their form state
-                docs = Document.objects.filter(_org_qs_filter(request)).order_by("-created_at")[:20]
-                return render(
-                    request,
-                    "core/upload.html",
-                    {
-                        "form": form,
-                        "docs": docs,
-                        "error": "Duplicate file detected (checksum match).",
-                    },
-                )
-
             doc.extracted_text = doc.extracted_text or ""
 
             #Debug
@@ -263,48 +438,37 @@ def upload_doc(request):
                 "extracted_text": repr(doc.extracted_text),
             })
 
-            doc.save()
-            # form.save_m2m()
-            # Build text chunks for RAG retrieval
-            if doc.extracted_text:
-                from .models import DocumentChunk
-                chunks = chunk_text(doc.extracted_text)
-                DocumentChunk.objects.bulk_create([
-                    DocumentChunk(
-                    document=doc,
-                    chunk_index=i,
-                    text=chunk,
-                    process=doc.process,
-                    doc_type=doc.doc_type,
-                    timestamp=doc.timestamp,
-                    )
-                    for i, chunk in enumerate(chunks)
-                ])
-
-            # Invalidate the unfiltered document list cache so the new doc appears immediately
-            cache.delete(_docs_cache_key(request))
-
-            # Pre-warm the report cache for this project (shifts LLM wait to upload time)
-            if doc.process:
-                uploader_clearance = _get_clearance_level(request)
-                warm_cache_key = _report_cache_key(
-                    str(doc.process_id), uploader_clearance, doc.created_at
+            # the per-organisation unique constraint is the duplicate check:
+            # one INSERT, and no window for two concurrent uploads to both pass
+            try:
+                with transaction.atomic():
+                    doc.save()
+            except IntegrityError as exc:
+                if violated_constraint(exc) != "doc_sha_unique_per_org":
+                    raise
+                # the file was already written to storage before the INSERT failed
+                if doc.file.name:
+                    enqueue(delete_storage_object, doc.file.name)
+                # Duplicate detected — re-render with error + keep their form state
+                docs = _upload_sidebar_docs(request)
+                return render(
+                    request,
+                    "core/upload.html",
+                    {
+                        "form": form,
+                        "docs": docs,
+                        "error": "Duplicate file detected (checksum match).",
+                    },
                 )
-                try:
-                    warmed = generate_project_report(
-                        str(doc.process_id), clearance_level=uploader_clearance
-                    )
-                    cache.set(warm_cache_key, warmed, 86400)
-                except Exception:
-                    # Granite unavailable — report will be generated on first view request
-                    pass
+            # form.save_m2m()
+            _finish_upload(request, doc)
 
             return redirect("upload")
         else:
             # Show validation errors + keep the recent docs list
             # Show *why* it failed
             log.warning("Upload invalid: %s", form.errors)
-            docs = Document.objects.filter(_org_qs_filter(request)).order_by("-created_at")[:20]
+            docs = _upload_sidebar_docs(request)
             return render(
                 request,
                 "core/upload.html",
@@ -313,8 +477,116 @@ def upload_doc(request):
 
     # GET
     form = DocumentForm()
-    docs = Document.objects.filter(_org_qs_filter(request)).order_by("-created_at")[:20]
-    return render(request, "core/upload.html", {"form": form, "docs": docs})
+    docs = _upload_sidebar_docs(request)
+    return render(
+        request,
+        "core/upload.html",
+        {"form": form, "docs": docs, "rejected_uploads": _rejected_uploads(request)},
+    )
+
+
+PRESIGN_TTL = 600  # seconds a presigned upload URL (and its key reservation) stays valid
+_SHA256_HEX = re.compile(r"[0-9a-f]{64}")
+_EXTRACTABLE_EXTS = (".pdf", ".docx")
+
+
+@login_required
+@role_required(*_UPLOAD_ROLES)
+@require_POST
+def upload_presign(request):
+    """
+    Step 1 of a direct upload: reserve an object key and hand back a presigned
+    PUT URL so the file bytes go browser -> MinIO without passing through Django.
+    The browser posts the document fields too, so they are validated here
+    rather than only at finalize, when the object would already be stored.
+    """
+    filename = os.path.basename(request.POST.get("filename", "")).strip()
+    if not filename or filename in (".", ".."):
+        return HttpResponseBadRequest("filename required")
+    filename = get_valid_filename(filename)
+
+    meta = DocumentMetadataForm(request.POST)
+    if not meta.is_valid():
+        return JsonResponse({"errors": meta.errors}, status=400)
+
+    # the browser hashes before asking for a URL, so a file this organisation
+    # already has is turned away before any bytes are sent. Only a pre-filter:
+    # the server re-hashes the stored object after finalize
+    checksum = request.POST.get("checksum_sha256", "")
+    organisation = meta.cleaned_data.get("organisation")
+    if _SHA256_HEX.fullmatch(checksum) and organisation:
+        duplicate = Document.objects.filter(
+            _org_qs_filter(request), organisation=organisation, checksum_sha256=checksum
+        ).exists()
+        if duplicate:
+            return JsonResponse({"error": "Duplicate file detected (checksum match)."}, status=409)
+
+    key = f"docs/{uuid.uuid4().hex}/{filename}"
+    # only keys we issued to this user can be finalised
+    cache.set(f"upload:presign:{key}", request.user.pk, PRESIGN_TTL)
+    return JsonResponse({"key": key, "url": presign_upload_url(key, expires_in=PRESIGN_TTL)})
+
+
+def _discard_direct_upload(request, key):
+    """
+    Delete an object PUT for a direct upload that finalize won't turn into a
+    Document. Only keys reserved for this user are touched: anything else may
+    be another user's upload, or not ours to name.
+    """
+    reservation = f"upload:presign:{key}"
+    if key and cache.get(reservation) == request.user.pk:
+        cache.delete(reservation)
+        enqueue(delete_storage_object, key)
+
+
+@login_required
+@role_required(*_UPLOAD_ROLES)
+@require_POST
+def upload_finalize(request):
+    """
+    Step 2 of a direct upload: create the Document row for an object the browser
+    has already PUT to MinIO. The request only reads the bytes back for text
+    extraction on PDF/DOCX files; the checksum the client sends is verified
+    against the stored object by tasks.compute_document_checksum, which keeps
+    the server's digest and removes the document on a mismatch or duplicate.
+
+    So the answer is 202, not 201: the upload is accepted pending verification.
+    The upload page shows it as verifying, and lists it if it is removed.
+    """
+    form = DirectUploadForm(request.POST)
+    if not form.is_valid():
+        # the object is already in MinIO; a retry presigns a new key, so this
+        # one would never be finalised
+        _discard_direct_upload(request, request.POST.get("s3_key", ""))
+        return JsonResponse({"errors": form.errors}, status=400)
+
+    key = form.cleaned_data["s3_key"]
+    reservation = f"upload:presign:{key}"
+    if cache.get(reservation) != request.user.pk:
+        return JsonResponse({"error": "Unknown or expired upload."}, status=400)
+    if not default_storage.exists(key):
+        cache.delete(reservation)
+        return JsonResponse({"error": "Unknown or expired upload."}, status=400)
+
+    doc = form.save(commit=False)
+    doc.created_by = request.user
+    doc.file.name = key
+    # the browser's digest is only a claim: the row goes in without a checksum,
+    # and Document.save queues compute_document_checksum to hash the stored
+    # object and compare
+    doc.checksum_sha256 = ""
+    doc.claimed_checksum = form.cleaned_data["checksum_sha256"]
+    doc.extracted_text = ""
+    if key.lower().endswith(_EXTRACTABLE_EXTS):
+        with default_storage.open(key, "rb") as fh:
+            doc.extracted_text = extract_text(fh) or ""
+    doc.save()
+    cache.delete(reservation)
+
+    _finish_upload(request, doc)
+    return JsonResponse(
+        {"id": str(doc.pk), "status": "verifying", "redirect": reverse("upload")}, status=202
+    )
 
 
 @login_required
@@ -337,12 +609,22 @@ def documents(request):
     type_choices = [("", "All types")] + [(t, t) for t in existing_types]
 
     form = DocumentSearchForm(request.GET or None, doc_type_choices=type_choices)
-    qs = Document.objects.filter(_org_qs_filter(request)).select_related("process", "organisation").order_by("-created_at")
+    # the cards never show the extracted text, the search vector or the
+    # project's outline, which are by far the widest columns on these rows
+    qs = (
+        Document.objects.filter(_org_qs_filter(request))
+        .select_related("process", "organisation")
+        .defer("extracted_text", "search_tsv", "process__geom")
+        .order_by("-created_at", "id")
+    )
 
     q_value = ""
     if form.is_valid():
 
-        # Full-text : title, doc_type, confidentiality, project name, org
+        # Full-text : title, extracted text, doc_type, confidentiality (all in
+        # search_tsv), plus project / org name. The names are matched in their
+        # own small tables (trigram indexed) and come back as id lists, so every
+        # branch of the OR can use an index on core_document
         q = form.cleaned_data.get("q", "").strip()
 
         if q:
@@ -352,10 +634,8 @@ def documents(request):
                 .annotate(rank=SearchRank('search_tsv', search_query))
                 .filter(
                     Q(search_tsv=search_query)
-                    | Q(doc_type__icontains=q)
-                    | Q(confidentiality__icontains=q)
-                    | Q(process__name__icontains=q)
-                    | Q(organisation__name__icontains=q)
+                    | Q(process__in=Process.objects.filter(name__icontains=q).values("id"))
+                    | Q(organisation__in=Organisation.objects.filter(name__icontains=q).values("id"))
                 )
                 .order_by('-rank', '-created_at')
             )
@@ -395,41 +675,14 @@ def documents(request):
 
     page_num = request.GET.get("page", "1")
 
-    # Serve from cache for the default view (no filters, page 1)
-    if not filters_active and page_num == "1":
-        cached = cache.get(_docs_cache_key(request))
-        if cached is not None:
-            # Reconstruct a Page-like proxy from the cached dict so the template
-            # interface (page.object_list, page.has_next, etc.) works unchanged.
-            page_proxy = SimpleNamespace(
-                object_list=cached["docs"],
-                has_other_pages=cached["has_next"] or cached["has_previous"],
-                has_previous=cached["has_previous"],
-                has_next=cached["has_next"],
-                number=1,
-                paginator=SimpleNamespace(num_pages=cached["num_pages"]),
-                previous_page_number=cached["prev_page_number"],
-                next_page_number=cached["next_page_number"],
-            )
-            return render(request, "core/documents.html", {
-                "form": form,
-                "page": page_proxy,
-                "q": "",
-                "filters_active": False,
-            })
-
-    page = _paginate(qs, request, per_page=24)
-
-    # cache only the unfiltered page-1 result abd Store a plain dict rather than the Page object to avoid serialising the full queryset into Redis
-    if not filters_active and page_num == "1":
-        cache.set(_docs_cache_key(request), {
-            "docs": list(page.object_list),
-            "num_pages": page.paginator.num_pages,
-            "has_next": page.has_next(),
-            "has_previous": page.has_previous(),
-            "next_page_number": page.next_page_number() if page.has_next() else None,
-            "prev_page_number": page.previous_page_number() if page.has_previous() else None,
-        }, DOCS_CACHE_TTL)
+    # Serve from cache for the default view (no filters, page 1).
+    # CountlessPage holds a plain list, so it pickles without the queryset
+    cache_default = not filters_active and page_num == "1"
+    page = cache.get(_docs_cache_key(request)) if cache_default else None
+    if page is None:
+        page = _paginate(qs, request, per_page=24)
+        if cache_default:
+            cache.set(_docs_cache_key(request), page, DOCS_CACHE_TTL)
 
     return render(request, "core/documents.html", {
         "form": form,
@@ -443,13 +696,16 @@ def documents(request):
 @log_view_access(Document)
 @require_GET
 def document_detail(request, pk):
-    doc = get_object_or_404(Document, pk=pk)
+    # the template shows process, organisation and uploader, so join them up front
+    doc = get_object_or_404(
+        Document.objects.select_related("process", "organisation", "created_by"), pk=pk
+    )
     if not request.user.is_superuser:
         if (
             hasattr(request.user, 'profile')
-            and request.user.profile.organisation
-            and doc.organisation
-            and doc.organisation != request.user.profile.organisation
+            and request.user.profile.organisation_id
+            and doc.organisation_id
+            and doc.organisation_id != request.user.profile.organisation_id
         ):
             raise PermissionDenied
     tag_labels = [TAG_LABEL.get(t, f"Tag {t}") for t in (doc.tags or [])]
@@ -520,7 +776,12 @@ def delete_document(request, pk):
 def prospects(request):
     Prospect = _get_model("core", "Prospect")
     if Prospect:
-        qs = Prospect.objects.filter(_org_qs_filter(request)).order_by("-created_at")
+        qs = (
+            Prospect.objects.filter(_org_qs_filter(request))
+            .select_related("organisation", "process")
+            .defer("process__geom")
+            .order_by("-created_at")
+        )
         page = _paginate(qs, request)
     else:
         qs, page = [], None
@@ -533,13 +794,15 @@ def prospects(request):
 
 @login_required
 def prospect_detail(request, pk):
-    prospect = get_object_or_404(Prospect, pk=pk)
+    prospect = get_object_or_404(
+        Prospect.objects.select_related("organisation", "process").defer("process__geom"), pk=pk
+    )
     if not request.user.is_superuser:
         if (
             hasattr(request.user, 'profile')
-            and request.user.profile.organisation
-            and prospect.organisation
-            and prospect.organisation != request.user.profile.organisation
+            and request.user.profile.organisation_id
+            and prospect.organisation_id
+            and prospect.organisation_id != request.user.profile.organisation_id
         ):
             raise PermissionDenied
     doc_links = DocLink.objects.filter(
@@ -596,7 +859,8 @@ def create_doc_link(request):
 
     app_label, model_name = _LINKABLE_MODELS[content_type_label]
     try:
-        ct = ContentType.objects.get(app_label=app_label, model=model_name)
+        # served from ContentType's per-process cache after the first lookup
+        ct = ContentType.objects.get_by_natural_key(app_label, model_name)
     except ContentType.DoesNotExist:
         return HttpResponseBadRequest("Content type not found.")
 
@@ -655,7 +919,12 @@ def delete_doc_link(request, pk):
 def drillholes(request):
     Drillhole = _get_model("core", "Drillhole")
     if Drillhole:
-        qs = Drillhole.objects.filter(_org_qs_filter(request)).order_by("-created_at")
+        qs = (
+            Drillhole.objects.filter(_org_qs_filter(request))
+            .select_related("organisation", "process")
+            .defer("process__geom")
+            .order_by("-created_at")
+        )
         page = _paginate(qs, request)
     else:
         qs, page = [], None
@@ -671,7 +940,12 @@ def drillholes(request):
 def tenements(request):
     Tenement = _get_model("core", "Tenement")
     if Tenement:
-        qs = Tenement.objects.filter(_org_qs_filter(request)).order_by("-created_at")
+        qs = (
+            Tenement.objects.filter(_org_qs_filter(request))
+            .select_related("organisation", "process")
+            .defer("process__geom")
+            .order_by("-created_at")
+        )
         page = _paginate(qs, request)
     else:
         qs, page = [], None
@@ -697,9 +971,15 @@ def ai_insights(request):
         request,
         "core/ai_insights.html",
         {
-            "recent_docs": Document.objects.filter(org_filter).order_by("-created_at")[:12],
-            "recent_projects": Process.objects.filter(org_filter).order_by("-created_at")[:8],
-            "recent_reports": SavedReport.objects.filter(org_filter).select_related("process").order_by("-created_at")[:10],
+            "recent_docs": _recent(request, Document, 12),
+            "recent_projects": _recent(request, Process, 8),
+            # the list only shows report metadata, so skip the markdown bodies
+            "recent_reports": (
+                SavedReport.objects.filter(org_filter)
+                .select_related("process")
+                .only("id", "title", "created_at", "version_number", "change_reason", "process__id", "process__name")
+                .order_by("-created_at")[:10]
+            ),
         },
     )
 
@@ -725,14 +1005,39 @@ def healthcheck(request):
 
 @login_required
 @require_GET
-def project_report_pdf(request, process_id: str):
+def project_report_stream(request, process_id: str):
+    """
+    Server-sent events stream of a freshly generated report, for HTMX's SSE
+    extension. Each event carries a JSON-encoded Markdown fragment; a final
+    `done` event tells the client to close the connection.
+    """
+    import json
+
     org_filter = _org_qs_filter(request)
     if not Process.objects.filter(org_filter, pk=process_id).exists():
         raise Http404("Project not found")
 
+    clearance_level = _get_clearance_level(request)
+
+    def events():
+        for fragment in stream_project_report(str(process_id), clearance_level=clearance_level):
+            yield f"data: {json.dumps(fragment)}\n\n"
+        yield "event: done\ndata: {}\n\n"
+
+    response = StreamingHttpResponse(events(), content_type="text/event-stream")
+    response["Cache-Control"] = "no-cache"
+    response["X-Accel-Buffering"] = "no"
+    return response
+
+
+@login_required
+@require_GET
+def project_report_pdf(request, process_id: str):
+    # one lookup both scopes the request and fetches the name for the filename
+    process = get_object_or_404(Process.objects.only("id", "name"), _org_qs_filter(request), pk=process_id)
+
     clearance_level = _get_clearance_level(request)
     md_text = _get_cached_report_md(process_id, clearance_level)
-    process = Process.objects.get(pk=process_id)
 
     buf = io.BytesIO()
     doc = SimpleDocTemplate(buf, pagesize=A4,
@@ -775,13 +1080,11 @@ def project_report_pdf(request, process_id: str):
 @login_required
 @require_GET
 def project_report_docx(request, process_id: str):
-    org_filter = _org_qs_filter(request)
-    if not Process.objects.filter(org_filter, pk=process_id).exists():
-        raise Http404("Project not found")
+    # one lookup both scopes the request and fetches the name for the filename
+    process = get_object_or_404(Process.objects.only("id", "name"), _org_qs_filter(request), pk=process_id)
 
     clearance_level = _get_clearance_level(request)
     md_text = _get_cached_report_md(process_id, clearance_level)
-    process = Process.objects.get(pk=process_id)
 
     doc = DocxDocument()
     style = doc.styles["Normal"]
@@ -853,12 +1156,15 @@ def geojson_projects(request):
     from django.core.serializers import serialize
     from .models import Process
 
-    # Only include processes with geometry
+    # Only include processes with geometry. The serializer writes foreign keys
+    # as ids, so there's no join, and only the columns the features use are loaded
     processes = Process.objects.filter(
         _org_qs_filter(request), geom__isnull=False
-    ).select_related('organisation')
+    ).only('id', 'name', 'mode', 'commodity', 'organisation', 'geom')
 
-    if not processes.exists():
+    # evaluate once: an exists() probe first would be a second query
+    processes = list(processes)
+    if not processes:
         return JsonResponse({"type": "FeatureCollection", "features": []})
 
     # Use GeoDjangos built in serialiser (lets us take coordinates and translate into GeoJSOn text for geodata)
@@ -886,9 +1192,10 @@ def geojson_tenements(request):
 
     tenements = Tenement.objects.filter(
         _org_qs_filter(request), geom__isnull=False
-    ).select_related('organisation', 'process')
+    )
 
-    if not tenements.exists():
+    tenements = list(tenements)
+    if not tenements:
         return JsonResponse({"type": "FeatureCollection", "features": []})
 
     geojson_data = serialize(
@@ -914,9 +1221,10 @@ def geojson_prospects(request):
 
     prospects = Prospect.objects.filter(
         _org_qs_filter(request), geom__isnull=False
-    ).select_related('organisation', 'process')
+    )
 
-    if not prospects.exists():
+    prospects = list(prospects)
+    if not prospects:
         return JsonResponse({"type": "FeatureCollection", "features": []})
 
     geojson_data = serialize(
@@ -942,9 +1250,10 @@ def geojson_drillholes(request):
 
     drillholes = Drillhole.objects.filter(
         _org_qs_filter(request), collar_location__isnull=False
-    ).select_related('organisation', 'process')
+    )
 
-    if not drillholes.exists():
+    drillholes = list(drillholes)
+    if not drillholes:
         return JsonResponse({"type": "FeatureCollection", "features": []})
 
     geojson_data = serialize(
@@ -1072,10 +1381,17 @@ def report_list_page(request):
         SavedReport.objects
         .filter(org_filter, clearance_level__in=accessible_levels)
         .select_related("process")
+        .defer("content_md", "process__geom")
         .order_by("-created_at")[:20]
     )
-    recent_projects = Process.objects.filter(org_filter).order_by("-created_at")[:20]
-    all_documents = Document.objects.filter(org_filter).select_related("process").order_by("-created_at")
+    # the project picker and document list only render names and metadata
+    recent_projects = Process.objects.filter(org_filter).only("id", "name").order_by("-created_at")[:20]
+    all_documents = (
+        Document.objects.filter(org_filter)
+        .select_related("process")
+        .defer("extracted_text", "search_tsv", "process__geom")
+        .order_by("-created_at")
+    )
 
     return render(request, "core/report_list.html", {
         "recent_reports":  recent_reports,
@@ -1109,13 +1425,12 @@ def generate_report(request):
         messages.error(request, "No project selected.")
         return redirect("report_list")
 
-    org_filter = _org_qs_filter(request)
-    if not Process.objects.filter(org_filter, pk=process_id).exists():
-        raise Http404("Project not found")
+    process = get_object_or_404(
+        Process.objects.only("id", "name", "organisation_id"), _org_qs_filter(request), pk=process_id
+    )
 
     clearance_level = _get_clearance_level(request)
     try:
-        process = get_object_or_404(Process, org_filter, pk=process_id)
         md = _get_cached_report_md(process_id, clearance_level)
     except Exception as e:
         log.error("Report generation failed during generate_report: %s", e)
@@ -1138,7 +1453,7 @@ def generate_report(request):
     else:
         SavedReport.objects.create(
             process=process,
-            organisation=process.organisation,
+            organisation_id=process.organisation_id,
             title=title,
             content_md=md,
             content_hash=hashlib.sha256(md.encode()).hexdigest(),
@@ -1315,6 +1630,7 @@ def report_history(request, process_id):
     reports = (
         SavedReport.objects
         .filter(org_filter, process_id=process_id)
+        .defer("content_md")
         .order_by("title", "-version_number")
     )
     # Group by title to show each report with its version chain
@@ -1328,17 +1644,19 @@ def report_history(request, process_id):
 @login_required
 def report_version_detail(request, report_id):
     """View a specific report version."""
-    report = get_object_or_404(SavedReport, pk=report_id)
+    report = get_object_or_404(
+        SavedReport.objects.select_related("process", "created_by").defer("process__geom"), pk=report_id
+    )
     all_versions = SavedReport.objects.filter(
-        process=report.process, title=report.title
-    ).order_by("-version_number")
+        process_id=report.process_id, title=report.title
+    ).defer("content_md").order_by("-version_number")
 
     log_audit(
         user=request.user,
         action=AuditLog.ActionType.VIEW,
         obj=report,
         description=f"Viewed '{report.title}' v{report.version_number}",
-        ip_address=request.META.get("REMOTE_ADDR"),
+        ip_address=get_user_ip(request),
         user_agent=request.META.get("HTTP_USER_AGENT", ""),
     )
     return render(request, "core/report_version_detail.html", {
@@ -1353,10 +1671,12 @@ def all_reports_history(request):
     from itertools import groupby
 
     org_filter = _org_qs_filter(request)
+    # each version row shows its author; the report bodies aren't rendered
     reports = (
         SavedReport.objects
         .filter(org_filter)
-        .select_related("process")
+        .select_related("process", "created_by")
+        .defer("content_md", "process__geom")
         .order_by("process__name", "title", "-version_number")
     )
 
@@ -1468,7 +1788,12 @@ def report_detail(request, report_id):
 @login_required
 def document_analysis_page(request):
     return render(request, "core/document_analysis.html", {
-        "recent_docs": Document.objects.filter(_org_qs_filter(request)).select_related("process").order_by("-created_at"),
+        "recent_docs": (
+            Document.objects.filter(_org_qs_filter(request))
+            .select_related("process")
+            .defer("extracted_text", "search_tsv", "process__geom")
+            .order_by("-created_at")
+        ),
     })
 
 
@@ -1490,8 +1815,10 @@ def analyze_document(request, pk):
         messages.error(request, "This document has no extracted text to analyse.")
         return redirect("document_analysis_page")
 
+    from core.ai.granite_client import get_granite_client
+
     try:
-        client = GraniteClient()
+        client = get_granite_client()
 
         prompt = f"""
 You are analysing a mining/exploration document.